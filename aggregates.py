@@ -0,0 +1,178 @@
+import copy
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from city_year import CityYearIndex, replace_city_rows, touched_cities
+from data_loader import YEARS, DerivedCache, default_gdp_path
+
+# Metrics summed per city and year for the trend charts
+TREND_METRICS = ["GDP (in billion $)", "Unemployment Rate (%)", "Tourism Sector Employment (%)"]
+# Sector shares, averaged per city and year
+SECTORS = ["Agriculture (%)", "Industry (%)", "Services (%)"]
+# Metrics with a precomputed "Top N cities" ranking per year
+TOP_METRICS = ["GDP (in billion $)", "Patents per 100,000 Inhabitants"]
+TOP_N = 10
+
+
+# Function to store a group's sorted row positions compactly: a slice when they form
+# one contiguous run (rows are then read as a view, so a memory-mapped dataset sorted by
+# year and city is never copied per process), else the positions themselves
+def _positions(positions):
+    if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+        return slice(int(positions[0]), int(positions[-1]) + 1)
+    return positions
+
+
+# Function to put a categorical City column on the given categories (codes are kept when
+# the categories only grew at the end)
+def _with_city_categories(frame, categories):
+    return frame.assign(City=frame["City"].cat.set_categories(categories))
+
+
+# Precomputed aggregates for one version of the GDP dataset.
+# The per-(city, year) metrics are kept in one table (the cube) sorted by city and year,
+# and the raw rows as one row order that lists them in the same order, so the state per
+# process is a few flat arrays however many cities there are. Lookups are binary searches
+# and slices. When rows are appended to the dataset, only the cube rows of the cities and
+# years they touch are recomputed.
+class GdpAggregates:
+    def __init__(self, gdp_data, version):
+        self.version = version
+        self.gdp_data = gdp_data
+        self._cube = None
+        self._year_positions = {}
+        self._top_cities = {}
+        self._sector_sums = pd.Series(0.0, index=SECTORS)
+        self._sector_counts = pd.Series(0, index=SECTORS)
+        self._add_rows(0)
+
+    # Function to get the aggregates of a newer version that only appended rows,
+    # from row first_new_row of gdp_data on. This object is left unchanged.
+    def with_appended_rows(self, gdp_data, version, first_new_row):
+        aggregates = copy.copy(self)
+        aggregates.version = version
+        aggregates.gdp_data = gdp_data
+        aggregates._year_positions = dict(self._year_positions)
+        aggregates._top_cities = dict(self._top_cities)
+        aggregates._add_rows(first_new_row)
+        return aggregates
+
+    # Function to (re)compute everything for the cities and years touched by the rows
+    # from first_new_row on (row 0: the whole dataset)
+    def _add_rows(self, first_new_row):
+        gdp_data = self.gdp_data
+        new_rows = gdp_data.iloc[first_new_row:]
+        city_rows = gdp_data if first_new_row == 0 else touched_cities(gdp_data, first_new_row)[1]
+
+        # (city, year) -> metric cube, one row per city and year, in City code order
+        by_city_year = city_rows.groupby(["City", "Year"], observed=True)
+        cube = by_city_year[TREND_METRICS].sum().join(by_city_year[SECTORS].mean()).reset_index()
+        cube = _with_city_categories(cube, gdp_data["City"].cat.categories)
+        if self._cube is None:
+            self._cube = cube.sort_values(["City", "Year"], ignore_index=True)
+        else:
+            self._cube = replace_city_rows(self._cube, cube)
+        self._cube_index = CityYearIndex(self._cube)
+
+        # Every row's position, sorted by (City code, Year): the run of rows of each
+        # (city, year) lines up with that city-year's row in the cube
+        city_codes = gdp_data["City"].cat.codes.to_numpy()
+        years = gdp_data["Year"].to_numpy()
+        self._row_order = np.lexsort((years, city_codes))
+        sorted_codes, sorted_years = city_codes[self._row_order], years[self._row_order]
+        self._run_starts = np.flatnonzero(np.r_[True, (np.diff(sorted_codes) != 0) | (np.diff(sorted_years) != 0)])
+        self._run_stops = np.r_[self._run_starts[1:], len(self._row_order)]
+
+        for year in pd.unique(new_rows["Year"]):
+            self._year_positions[int(year)] = _positions(np.flatnonzero(years == year))
+            rows = self.year_rows(year)
+            for metric in TOP_METRICS:
+                self._top_cities[(int(year), metric)] = rows.nlargest(TOP_N, metric)
+        self._sector_sums = self._sector_sums + new_rows[SECTORS].astype("float64").sum()
+        self._sector_counts = self._sector_counts + new_rows[SECTORS].count()
+
+        # National / whole-dataset views, rebuilt from the cube
+        self.years = sorted(self._year_positions)
+        self.cities = sorted(str(city) for city in self._cube["City"].unique())
+        self.national_trend = self._cube.groupby("Year")["GDP (in billion $)"].sum().reset_index()
+        self.sector_mean = (self._sector_sums / self._sector_counts).reset_index()
+        self.sector_mean.columns = ["Sector", "Percentage"]
+        # Treemap leaves are summed by plotly anyway, so store one row per (city, sector)
+        treemap_data = self._cube.groupby("City", observed=True)[SECTORS].sum().reset_index()
+        treemap_data["City"] = treemap_data["City"].astype(str)
+        self.treemap_data = treemap_data.melt(id_vars="City", var_name="Sector", value_name="Percentage")
+
+    # Function to get a city's yearly trend for the given metrics
+    def city_trend(self, city, metrics):
+        first, last = self._cube_index.span(city)
+        return self._cube.iloc[first:last][["Year"] + list(metrics)].reset_index(drop=True)
+
+    # Function to get a city's sector shares per year, in long format
+    def sector_trend(self, city):
+        return self.city_trend(city, SECTORS).melt(id_vars="Year", var_name="Sector", value_name="Percentage")
+
+    # Function to list the years a city has rows in
+    def city_years(self, city):
+        return self._cube_index.years(city)
+
+    # Function to get the raw rows of one city in one year (no rows if it has none that year)
+    def city_year_rows(self, city, year):
+        index = self._cube_index.row(city, year)
+        if index is None:
+            return self.gdp_data.iloc[:0]
+        positions = np.sort(self._row_order[self._run_starts[index]:self._run_stops[index]])
+        return self.gdp_data.iloc[_positions(positions)]
+
+    # Function to get every city's rows for one year
+    def year_rows(self, year):
+        return self.gdp_data.iloc[self._year_positions[int(year)]]
+
+    # Function to get the top cities of a year by one metric
+    def top_cities(self, year, metric):
+        return self._top_cities[(int(year), metric)]
+
+
+# Latest aggregates per dataset and year window
+_aggregates = DerivedCache(GdpAggregates)
+
+# Seconds between dataset checks by the background watcher (GDP_WATCH_INTERVAL; 0 turns it off)
+WATCH_INTERVAL = float(os.environ.get("GDP_WATCH_INTERVAL", "30"))
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+logger = logging.getLogger(__name__)
+
+
+# Function to get the aggregates for the current dataset version (None if the
+# dataset is missing or has no rows in the year window).
+# If the dataset only grew since the cached version, the new rows are merged in.
+def get_aggregates(path=None, years=YEARS):
+    return _aggregates.get(path, years)
+
+
+# Function run by the watcher thread: check the dataset every interval seconds
+def _watch(path, interval):
+    while True:
+        time.sleep(interval)
+        try:
+            get_aggregates(path)
+        except Exception:
+            logger.exception("Refreshing the GDP aggregates failed")
+
+
+# Function to keep the aggregates of a dataset fresh in a background thread, so rows
+# appended to it are merged before the next page load asks for them. Safe to call on every rerun.
+def start_watcher(path=None, interval=WATCH_INTERVAL):
+    key = os.path.abspath(path or default_gdp_path())
+    if interval <= 0 or key in _watchers:
+        return
+    with _watchers_lock:
+        if key not in _watchers:
+            watcher = threading.Thread(target=_watch, args=(path, interval), name="gdp-data-watcher", daemon=True)
+            watcher.start()
+            _watchers[key] = watcher
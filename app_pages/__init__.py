@@ -0,0 +1,19 @@
+import importlib
+
+# Sidebar pages in menu order: page name -> module in this package with a render(page)
+# function. render gets the page name, the key its charts (charts.CHARTS) and profile samples use.
+# A page's module, and whatever it imports (pandas, plotly, the dataset), is loaded the first
+# time that page is shown, so the login screen and the light pages never pay for it.
+PAGES = {
+    "Home": "home",
+    "About": "about",
+    "Dashboard": "dashboard",
+    "Insights & Analysis": "insights",
+    "Feedback": "feedback",
+    "Chatbot": "chatbot",
+}
+
+
+# Function to draw one sidebar page, importing its module on first use
+def render_page(name):
+    importlib.import_module(f"{__name__}.{PAGES[name]}").render(name)
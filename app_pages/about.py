@@ -0,0 +1,51 @@
+import streamlit as st
+
+
+# Function to draw the About page
+def render(page):
+    st.title("About")
+    st.write("""
+    This application is designed to provide dashboards, insights, and a chatbot for better user experience.
+    You can navigate through different sections using the sidebar.
+    """)
+    st.subheader("📚 *Data Sources*")
+    st.write("""
+    The data used in this dashboard is taken from a combination of:
+    - Research Papers
+    - Kaggle datasets
+    These sources are carefully selected and cleaned the data for the visualisation.
+    """)
+
+    st.subheader("🎯 *Key Features*")
+    
+    st.write("""
+    ### GDP Analysis
+    - *GDP by City:* Visual representation of GDP distribution across different cities. Key cities include Delhi, Mumbai, Kolkata, and Bengaluru.
+    - *Sector-wise Contribution:* Breakdown of GDP by various sectors like Agriculture, ICT, Services, and Industry.
+    - *Top GDP Cities:* Highlighting cities with the highest GDP values.
+    
+    ### Employment Trends
+    - *Employment Analysis:* Insight into employment rates across various sectors like Tourism, ICT, and Services.
+    - *Unemployment Trends:* Visualization of unemployment rates over the years and by city.
+    - *Youth Employment:* Analysis of youth unemployment rates and trends.
+    
+    ### R&D Expenditure
+    - *R&D Insights:* Examination of R&D expenditure as a percentage of GDP in different cities.
+    - *Patents Analysis:* Correlation between R&D spending and the number of patents filed per 100,000 inhabitants.
+    - *City-wise R&D Data:* Detailed breakdown of R&D expenditure by city.
+    
+    ### Population Data
+    - *Population Impact:* Visualizations of population data, including growth trends and distribution across cities.
+    - *City Population:* Highlighting cities with the highest population figures.
+    - *Yearly Trends:* Year-over-year population growth and its economic implications.
+    """)
+    
+    st.subheader("🌟 *Summary*")
+    st.write("""
+    This dashboard aims to provide a deep dive into the economic and demographic data of Indian cities. By presenting complex data in an accessible and interactive format, we hope to facilitate better understanding and decision-making for policymakers, researchers, and the general public.
+    """)
+    
+    st.subheader("⚠ *Disclaimer*")
+    st.write("""
+    The data presented in this dashboard is intended for informational purposes only. While we strive for accuracy, the information is provided "as is" without any warranty of any kind.
+    """)
@@ -0,0 +1,49 @@
+import streamlit as st
+
+import profiling
+from aggregates import get_aggregates, start_watcher
+from charts import get_figure
+from city_year import TOTALS_COLUMNS
+from data_loader import load_gdp_dataset
+from kpis import get_kpis
+from rankings import get_rankings
+
+
+# Function to load (or fetch) the shared dataset (the given columns, default: all) under
+# its own "data" timer, so the profile tells reading the data apart from building aggregates on it
+def _load_data(page_name, columns=None):
+    with profiling.timed(page_name, "data", "load_gdp_data"):
+        load_gdp_dataset(columns=columns)
+
+
+# Function to get the precomputed chart aggregates (shared; rebuilt only when the dataset changes,
+# and rows appended to it are merged in by a background watcher)
+def load_aggregates(page_name):
+    start_watcher()
+    _load_data(page_name)
+    with profiling.timed(page_name, "aggregate", "get_aggregates"):
+        return get_aggregates()
+
+
+# Function to get the Dashboard KPIs (shared; cached per dataset version, appended rows merged in)
+def load_kpis(page_name):
+    _load_data(page_name, TOTALS_COLUMNS)
+    with profiling.timed(page_name, "aggregate", "get_kpis"):
+        return get_kpis()
+
+
+# Function to get the city rankings (shared; cached per dataset version, appended rows merged in)
+def load_rankings(page_name):
+    _load_data(page_name, TOTALS_COLUMNS)
+    with profiling.timed(page_name, "aggregate", "get_rankings"):
+        return get_rankings()
+
+
+# Function to build (or fetch) a chart's figure and send it to the browser, timing both steps
+def show_chart(page_name, chart, aggregates, city=None, year=None):
+    with profiling.timed(page_name, "figure", chart):
+        figure = get_figure(page_name, chart, aggregates, city, year)
+    emit_started = profiling.start_timer()
+    st.plotly_chart(figure, use_container_width=True)
+    if emit_started is not None:
+        profiling.stop_timer(emit_started, page_name, "emit", chart, size=lambda: len(figure.to_json()))
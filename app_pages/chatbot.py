@@ -0,0 +1,10 @@
+import streamlit as st
+import streamlit.components.v1 as components
+
+
+# Function to draw the Chatbot page
+def render(page):
+    st.title("🤖 Chatbot")
+    st.write("This is where a chatbot can be integrated.")
+    chatbase_iframe_url = "https://www.chatbase.co/chatbot-iframe/47BlpnTPkr5z7R_hbm-UZ"
+    components.iframe(chatbase_iframe_url, width=700, height=700, scrolling=True)
@@ -0,0 +1,43 @@
+import math
+
+import streamlit as st
+
+from app_pages.analytics import load_kpis
+from kpis import KPIS, LOWER_IS_BETTER, NATIONAL
+
+
+# Function to draw the Dashboard page
+def render(page):
+    st.title("📊 Dashboard")
+    st.write(f"Welcome, {st.session_state['name']}! This is the dashboard page where you can see the charts and reports of Indian cities .")
+    # Example Placeholder Chart
+    power_bi_url = "https://app.powerbi.com/reportEmbed?reportId=31a2b374-2556-4b45-9990-4b225ce6e2ab&autoAuth=true&ctid=09429612-44e7-430e-bdfa-3c437016bdad"
+    st.markdown(f'<iframe width="100%" height="600" src="{power_bi_url}" frameborder="0" allowFullScreen="true"></iframe>', unsafe_allow_html=True)
+     # Key Economic Metrics Summary
+    kpis = load_kpis(page)
+    if kpis is None:
+        st.write("🚨 Data unavailable. Please check the source file.")
+    else:
+        st.markdown("### *📌 Key Economic Indicators*")
+        scope = st.selectbox("Indicators for", [NATIONAL] + kpis.cities)
+        # Each city is shown for its own latest year, so a partly reported year hides no one
+        year = kpis.latest_year(scope)
+        if scope == NATIONAL:
+            st.caption(f"{year}: {kpis.cities_reported(year)} of {len(kpis.cities)} cities reported; "
+                       "changes compare the cities reported in both years.")
+        else:
+            st.caption(f"Latest data for {scope}: {year}")
+        values = kpis.get(scope, year)
+        for column, (kpi, label) in zip(st.columns(len(KPIS)), KPIS.items()):
+            value, delta = values[kpi]
+            with column:
+                st.metric(label=label, value="n/a" if math.isnan(value) else f"{value:.1f}%",
+                          delta=None if math.isnan(delta) else f"{delta:+.1f} pp from last year",
+                          delta_color="inverse" if kpi in LOWER_IS_BETTER else "normal")
+
+    st.markdown("---")
+    st.markdown("### 🔍 Want to explore more? ")
+    
+    if st.button("Insights & Analysis"):
+        st.session_state["page"] = "📈 Insights & Analysis"
+        st.rerun()
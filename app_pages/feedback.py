@@ -0,0 +1,15 @@
+import streamlit as st
+
+
+# Function to draw the Feedback page
+def render(page):
+    st.title("📝 Feedback")
+    st.write("We value your feedback. Please share your thoughts below.")
+    name = st.text_input("Name")
+    email = st.text_input("Your Email")
+    category = st.selectbox("Feedback Category", ["General Feedback", "Bug Report", "Feature Request", "Other"])
+    feedback_text = st.text_area("Write your feedback here:")
+    # Slider for satisfaction level
+    satisfaction_level = st.slider("How satisfied are you with the dashboard?", 1, 10, 1)
+    if st.button("Submit Feedback"):
+        st.success("✅ Thank you for your feedback!")
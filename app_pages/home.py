@@ -0,0 +1,47 @@
+import streamlit as st
+
+from app_pages.analytics import load_aggregates, show_chart
+
+
+# Function to draw the Home page
+def render(page):
+    st.title("🌍 India City GDP Dashboard")
+    st.write(f"Welcome, {st.session_state['name']}! This is showing about the GDP of different states in India.")
+    st.subheader("\U0001F4DD Purpose")
+    st.write("📈this creation of the web site is for the purpose of providing the gdp rates of different cities in the India.")
+    st.write("📊 this gives the data insights of the gdp in different sectors.")
+    st.write("💡this helps to make decisions of different things across the cities")
+    st.subheader("📌 Target Audience & Scope")
+    with st.expander("👔 Policy Makers & Economists"):
+        st.write("- Understand economic trends for policy planning.")
+        st.write("- Use data insights for national and local economic policies.")
+    with st.expander("💰 Business Investors"):
+        st.write("- Identify promising cities for investments.")
+        st.write("- Use GDP data for market research and decision-making.")        
+    with st.expander("📊 Researchers & Academics"):
+        st.write("- Study economic patterns at the city level.")
+        st.write("- Conduct in-depth research using real economic data.")
+    with st.expander("🌍 General Public & Enthusiasts"):
+        st.write("- Explore India's financial landscape.")
+        st.write("- Gain awareness of economic growth and trends.") 
+    st.subheader("🌟 Key Insights")
+    st.write("🔹 *Fastest Growing Cities:* Cities with the highest GDP growth in recent years.")
+    st.write("🔹 *Sector Contributions:* Identifying which sectors drive the most growth of gdp in India's cities.")
+    st.write("🔹 *Employment Trends:* The correlation between GDP and employment in major cities.")
+    st.write("🔹 *Investment Hotspots:* Areas showing the highest economic potential for businesses and startups.")
+    st.subheader("📌 *Overview*")
+    st.write("This dashboard provides interactive and visual insights into India's GDP trends across various cities.")
+    st.write("It enables policymakers, researchers, and investors to analyze economic trends effectively and make data-driven decisions.")
+    st.write("Users can explore interactive charts, sector-wise breakdowns, and dynamic GDP trends to better understand India's economic landscape.") 
+
+    st.subheader("📊 *Visualizations*")
+    
+    aggregates = load_aggregates(page)
+    if aggregates is not None:
+        # Dynamic GDP Trend Visualization
+        show_chart(page, "gdp_trend", aggregates)
+        
+        # Dynamic Sector Breakdown
+        show_chart(page, "sector_pie", aggregates)
+    else:
+        st.write("🚨 Data unavailable. Please check the source file.")
@@ -0,0 +1,81 @@
+import streamlit as st
+
+from app_pages.analytics import load_aggregates, load_rankings, show_chart
+from charts import unmapped_cities
+from rankings import RANKING_METRICS, TOP_K
+
+
+# Function to draw the Insights & Analysis page
+def render(page):
+    st.title("📈 Insights & Analysis")
+    st.write("Analyze your data and display insights here.")
+    aggregates = load_aggregates(page)
+    if aggregates is None:
+        st.write("🚨 Data unavailable. Please check the source file.")
+        return
+    st.subheader("💡 Key Insight:")
+    st.info(f"Our data shows the insigths of th gdp of diferent states over the years {aggregates.years[0]}-{aggregates.years[-1]}!")
+    st.subheader("Deep Dive into India's GDP Data")
+
+    # Filters
+    selected_year = st.selectbox("Select Year", sorted(aggregates.years, reverse=True))
+    selected_city = st.selectbox("Select City", aggregates.cities)
+
+    # Chart sections, in page order: (chart in charts.py, picker label, section title)
+    sections = [
+        ("gdp_trend", "GDP Growth Trend", f"GDP Growth Trend in {selected_city} ({selected_year})"),
+        ("gdp_vs_unemployment", "GDP vs Unemployment Rate", "GDP vs Unemployment Rate"),
+        ("gdp_map", "GDP by City (Map)", "GDP by City (Choropleth Map)"),
+        ("sector_pie", "Sector-wise GDP Contribution", "Sector-wise GDP Contribution"),
+        ("top_gdp", "Top 10 Cities by GDP", "Top 10 Cities by GDP"),
+        ("india_vs_global", "India vs Global GDP Growth", "India vs Global GDP Growth"),
+        ("treemap", "GDP Distribution by City and Sector", "GDP Distribution by City and Sector"),
+        ("unemployment_trend", "Unemployment Rate Trends", f"Unemployment Rate Trends in {selected_city}"),
+        ("scatter_3d", "GDP vs R&D vs Population (3D)", "GDP vs R&D vs Population (3D Scatter Plot)"),
+        ("top_patents", "Top 10 Cities by Patents", "Top 10 Cities by Patents"),
+        ("sector_area", "Sector-wise GDP Contribution Over Time", "Sector-wise GDP Contribution Over Time"),
+        ("tourism_trend", "Tourism Sector Employment Trends", f"Tourism Sector Employment Trends in {selected_city}"),
+        ("gdp_histogram", "GDP Distribution Across Cities", "GDP Distribution Across Cities"),
+        ("sector_polar", "Sector-wise GDP Contribution (Polar)", "Sector-wise GDP Contribution (Polar Chart)"),
+    ]
+    # Only the picked charts are built and sent to the browser
+    picked_labels = st.multiselect("Charts to show", options=[label for _, label, _ in sections],
+                                   default=[sections[0][1]])
+
+    for chart, label, title in sections:
+        if label not in picked_labels:
+            continue
+        st.subheader(title)
+        if chart == "gdp_map":
+            missing_cities = unmapped_cities(aggregates)
+            if missing_cities:
+                st.caption("No coordinates for: " + ", ".join(missing_cities))
+        # Charts come from charts.py through the shared figure cache
+        show_chart(page, chart, aggregates, selected_city, selected_year)
+    
+    st.markdown("---")
+    st.subheader("🏆 Fastest Growing Cities & Investment Hotspots")
+    rankings = load_rankings(page)
+    if rankings is not None:
+        labels = {label: metric for metric, label in RANKING_METRICS.items()}
+        metric = labels[st.selectbox("Rank cities by", list(labels))]
+        top_k = st.slider("Cities to show", min_value=5, max_value=50, value=TOP_K)
+        top = rankings.top(metric, selected_year, top_k)
+        if top.empty:
+            st.info(f"No city has a {RANKING_METRICS[metric]} value for {selected_year} yet.")
+        else:
+            st.dataframe(top, hide_index=True, use_container_width=True)
+        rank, ranked = rankings.rank_of(selected_city, metric, selected_year)
+        if rank is not None:
+            st.write(f"📍 *{selected_city} ranks #{rank} of {ranked} cities in {selected_year}.*")
+        else:
+            st.write(f"📍 *{selected_city} has no {RANKING_METRICS[metric]} ranking in {selected_year}.*")
+        st.caption("Investment score: weighted per-year z-scores of GDP CAGR, rolling GDP growth, R&D expenditure, "
+                   "patents and (inverted) unemployment. CAGR runs from each city's first year in the data.")
+
+    st.markdown("---")
+    st.subheader("📝 Insights Summary")
+    st.write("✔ *GDP growth trends highlight economic hotspots.*")
+    st.write("✔ *Sector contributions show the economic drivers of each city.*")
+    st.write("✔ *Investment hotspots offer guidance for investors.*")
+    st.write("✔ *India's GDP trends compared globally reveal growth potential.*")
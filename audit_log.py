@@ -0,0 +1,138 @@
+import atexit
+import json
+import os
+import threading
+from datetime import datetime, timezone
+
+try:
+    import fcntl  # lets several server processes share one log file (not on Windows)
+except ImportError:
+    fcntl = None
+
+# Login audit log: one JSON object per line
+LOGIN_LOG_FILE = "logged_in_users.jsonl"
+
+
+# Buffered, append-only audit log.
+# Events are queued in memory and written by a background thread once
+# batch_size events are waiting or flush_interval seconds have passed,
+# so callers never wait on the disk.
+class AuditLog:
+    def __init__(self, path=LOGIN_LOG_FILE, batch_size=100, flush_interval=2.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._pending = []
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+
+    # Function to queue one event (a dict); a UTC timestamp is added if missing
+    def log(self, event):
+        event = dict(event)
+        event.setdefault("timestamp", datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("audit log is closed")
+            self._pending.append(line)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+    # Function to write everything queued so far, from the calling thread
+    def flush(self):
+        with self._condition:
+            lines, self._pending = self._pending, []
+        self._write(lines)
+
+    # Function to flush and stop the background writer
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    # Background loop: wait for a full batch or the interval, then write
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._closed and len(self._pending) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                lines, self._pending = self._pending, []
+                closed = self._closed
+            self._write(lines)
+            if closed:
+                return
+
+    # Function to append whole lines in one write, rotating the file first if it is too big
+    def _write(self, lines):
+        if not lines:
+            return
+        data = "".join(lines).encode("utf-8")
+        with self._write_lock:
+            fd = self._open_locked()
+            try:
+                size = os.fstat(fd).st_size
+                if self.max_bytes and size > 0 and size + len(data) > self.max_bytes:
+                    self._rotate()
+                    os.close(fd)
+                    fd = self._open_locked()
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+
+    # Function to open the current log file and lock it against other processes.
+    # If another process rotated the file while we waited, reopen the new one.
+    def _open_locked(self):
+        while True:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if fcntl is None:
+                return fd
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(fd).st_ino == os.stat(self.path).st_ino:
+                    return fd
+            except FileNotFoundError:
+                pass
+            os.close(fd)
+
+    # Function to shift path -> path.1 -> path.2 ... (called with the lock held)
+    def _rotate(self):
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+# One writer per process, shared by every session
+_login_log = None
+_login_log_lock = threading.Lock()
+
+
+# Function to get the process-wide login audit log
+def get_login_log():
+    global _login_log
+    if _login_log is None:
+        with _login_log_lock:
+            if _login_log is None:
+                _login_log = AuditLog()
+                atexit.register(_login_log.close)
+    return _login_log
+
+
+# Function to record a successful login without blocking on disk
+def record_login(name, username):
+    get_login_log().log({"event": "login", "name": name, "username": username})
@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregates import get_aggregates
+from charts import CHARTS, INSIGHTS
+
+# Insights charts exported for every city and year
+REPORT_CHARTS = ["gdp_trend", "sector_pie", "unemployment_trend", "tourism_trend", "sector_polar"]
+REPORT_FORMATS = ["html", "png", "json"]
+REPORTS_DIR = "reports"
+# Records which dataset version each output was rendered from
+MANIFEST_FILE = "manifest.json"
+
+
+# Function to turn a city name into a safe folder name
+def _safe_name(name):
+    return re.sub(r"[^\w\- ]", "_", name).strip() or "_"
+
+
+# Function to get an output path relative to the reports folder.
+# Charts that don't depend on the year are written once per city, not once per year.
+def _output_path(chart, city, year, fmt):
+    _, depends_on = CHARTS[(INSIGHTS, chart)]
+    if "year" in depends_on:
+        return os.path.join(_safe_name(city), str(year), f"{chart}.{fmt}")
+    return os.path.join(_safe_name(city), f"{chart}.{fmt}")
+
+
+# Function to write one figure in one format
+def _write_figure(figure, path, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    if fmt == "html":
+        figure.write_html(temp_path, include_plotlyjs="cdn")
+    elif fmt == "json":
+        figure.write_json(temp_path)
+    else:
+        # Static images need the optional kaleido package
+        figure.write_image(temp_path, format=fmt)
+    os.replace(temp_path, path)
+
+
+# Function run in a worker process: render every output of one city
+def _render_city(task):
+    data_path, out_dir, city, jobs = task
+    aggregates = get_aggregates(data_path)
+    written = []
+    for chart, year, formats in jobs:
+        builder, _ = CHARTS[(INSIGHTS, chart)]
+        figure = builder(aggregates, city, year)
+        for fmt in formats:
+            relative_path = _output_path(chart, city, year, fmt)
+            _write_figure(figure, os.path.join(out_dir, relative_path), fmt)
+            written.append(relative_path)
+    return written
+
+
+# Function to load the manifest of earlier runs
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, MANIFEST_FILE)) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+
+# Function to save the manifest in one atomic replace
+def _save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    with open(f"{path}.tmp", "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+# Function to render every (city, year) report that is missing or out of date.
+# Returns (outputs written, outputs skipped).
+def generate_reports(data_path=None, out_dir=REPORTS_DIR, charts=REPORT_CHARTS, formats=("html", "json"),
+                     workers=None, force=False):
+    aggregates = get_aggregates(data_path)
+    if aggregates is None:
+        raise FileNotFoundError("GDP dataset not found, or no rows in the year window (GDP_YEARS)")
+    if "png" in formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            raise RuntimeError("PNG output needs the kaleido package (pip install kaleido)")
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {} if force else _load_manifest(out_dir)
+
+    # One task per city, holding only the outputs that are missing or from another dataset version
+    # Year charts are only rendered for the years a city has rows in
+    tasks, skipped, planned = [], 0, set()
+    for city in aggregates.cities:
+        jobs = []
+        city_years = aggregates.city_years(city)
+        for chart in charts:
+            _, depends_on = CHARTS[(INSIGHTS, chart)]
+            for year in (city_years if "year" in depends_on else aggregates.years[-1:]):
+                todo = []
+                for fmt in formats:
+                    relative_path = _output_path(chart, city, year, fmt)
+                    if relative_path in planned:
+                        continue
+                    planned.add(relative_path)
+                    if manifest.get(relative_path) == aggregates.version and os.path.exists(os.path.join(out_dir, relative_path)):
+                        skipped += 1
+                    else:
+                        todo.append(fmt)
+                if todo:
+                    jobs.append((chart, year, todo))
+        if jobs:
+            tasks.append((data_path, out_dir, city, jobs))
+
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for paths in pool.map(_render_city, tasks):
+            for relative_path in paths:
+                manifest[relative_path] = aggregates.version
+            written += len(paths)
+    _save_manifest(out_dir, manifest)
+    return written, skipped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the Insights charts for every city and year to static files")
+    parser.add_argument("--data", help="CSV file or Parquet dataset folder (default: the app's dataset)")
+    parser.add_argument("--out", default=REPORTS_DIR, help="output folder")
+    parser.add_argument("--charts", default=",".join(REPORT_CHARTS), help="comma-separated charts")
+    parser.add_argument("--formats", default="html,json", help="comma-separated: " + ", ".join(REPORT_FORMATS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--force", action="store_true", help="re-render outputs even if unchanged")
+    args = parser.parse_args()
+
+    formats = [fmt for fmt in args.formats.split(",") if fmt]
+    unknown = [fmt for fmt in formats if fmt not in REPORT_FORMATS]
+    if unknown:
+        parser.error(f"unknown format: {', '.join(unknown)}")
+    charts = [chart for chart in args.charts.split(",") if chart]
+    unknown = [chart for chart in charts if (INSIGHTS, chart) not in CHARTS]
+    if unknown:
+        parser.error(f"unknown chart: {', '.join(unknown)}")
+    start = time.perf_counter()
+    try:
+        written, skipped = generate_reports(args.data, args.out, charts, formats, args.workers, args.force)
+    except (FileNotFoundError, RuntimeError) as error:
+        parser.exit(1, f"{error}\n")
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {written} files, skipped {skipped} unchanged, in {elapsed:.1f} s "
+          f"({written / elapsed if elapsed else 0:.1f} files/s, {args.workers} workers)")
@@ -0,0 +1,56 @@
+# Benchmark: cold start and login-page rerun latency.
+# Each sample starts a fresh interpreter, so module imports are paid again as on a new server process.
+# Run from anywhere:  python benchmarks/bench_cold_start.py [--runs N] [--reruns N]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter: time the first script run, then reruns of the login page
+CHILD = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("App1.py", default_timeout=120)
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+reruns = []
+for _ in range(int(sys.argv[1])):
+    start = time.perf_counter()
+    at.run()
+    reruns.append(time.perf_counter() - start)
+if at.exception:
+    raise RuntimeError(at.exception[0].value)
+heavy = sorted(name for name in ("pandas", "plotly.express", "pyarrow", "charts", "aggregates") if name in sys.modules)
+print(json.dumps({"cold": cold, "reruns": reruns, "heavy": heavy}))
+"""
+
+
+# Function to run one fresh-interpreter sample
+def sample(reruns):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.run([sys.executable, "-c", CHILD, str(reruns)], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start and login-page rerun latency")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters")
+    parser.add_argument("--reruns", type=int, default=20, help="login-page reruns per interpreter")
+    args = parser.parse_args()
+
+    samples = [sample(args.reruns) for _ in range(args.runs)]
+    cold = [result["cold"] for result in samples]
+    reruns = [value for result in samples for value in result["reruns"]]
+    print(f"Cold start (first run of the login page): median {statistics.median(cold) * 1000:.0f} ms")
+    print(f"Login-page rerun: median {statistics.median(reruns) * 1000:.1f} ms")
+    print(f"Heavy modules loaded on the login page: {', '.join(samples[-1]['heavy']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
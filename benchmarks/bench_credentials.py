@@ -0,0 +1,97 @@
+# Load test: thousands of concurrent register calls and login lookups against the
+# credential store, then full logins (lookup plus password check on the bounded hash
+# pool, as App1.check_login does) for a sample of users, with right and wrong passwords.
+# Run from anywhere:  python benchmarks/bench_credentials.py [--users N] [--logins N] [--threads N]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import credentials
+import passwords
+
+PASSWORD = "secret"
+
+
+# Function to log in the way App1.check_login does: look the user up, then check the
+# password on the hash pool (an unknown user is checked against a dummy hash). Returns ok.
+def login(username, password, db_path):
+    user = credentials.get_user(username, db_path)
+    ok, _ = passwords.check_password(password, None if user is None else user["password"])
+    return ok
+
+
+# Function to run one call and return (elapsed seconds, result)
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+# Function to print throughput and latency percentiles for a batch of calls
+def report(label, results, wall_time):
+    latencies = sorted(elapsed for elapsed, _ in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{label}: {len(latencies)} calls, {len(latencies) / wall_time:,.0f} calls/s, "
+          f"p50 {quantiles[49] * 1000:.2f} ms, p95 {quantiles[94] * 1000:.2f} ms, "
+          f"p99 {quantiles[98] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent register/login load test")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--logins", type=int, default=100,
+                        help="users that log in with a full password check (each costs one KDF run)")
+    parser.add_argument("--threads", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, credentials.CREDENTIALS_DB)
+        usernames = [f"user{i}" for i in range(args.users)]
+        # Hashed once, with the app's scheme: the register phase measures store writes
+        password_hash = passwords.hash_password(PASSWORD)
+
+        with ThreadPoolExecutor(args.threads) as pool:
+            # Every username is registered twice at once: exactly one of each pair must win
+            start = time.perf_counter()
+            registrations = list(pool.map(
+                lambda username: timed(credentials.add_user, username, username, password_hash, db_path),
+                usernames + usernames))
+            report("register", registrations, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            logins = list(pool.map(lambda username: timed(credentials.get_user, username, db_path), usernames))
+            report("login lookup (store only)", logins, time.perf_counter() - start)
+
+            # Own salted hash per user, so no check is answered from the memo of recent logins
+            checked = usernames[:args.logins]
+            own_hashes = list(pool.map(lambda _: passwords.hash_password_in_pool(PASSWORD), checked))
+            for username, own_hash in zip(checked, own_hashes):
+                credentials.update_password(username, own_hash, db_path)
+            start = time.perf_counter()
+            checks = list(pool.map(lambda username: timed(login, username, PASSWORD, db_path), checked))
+            report(f"login ({passwords.HASH_WORKERS} hash workers)", checks, time.perf_counter() - start)
+            start = time.perf_counter()
+            rejections = list(pool.map(lambda username: timed(login, username, "wrong", db_path), checked))
+            report("failed login", rejections, time.perf_counter() - start)
+
+        accepted = sum(1 for _, inserted in registrations if inserted)
+        found = sum(1 for _, user in logins if user is not None)
+        logged_in = sum(1 for _, ok in checks if ok)
+        rejected = sum(1 for _, ok in rejections if not ok)
+        print(f"accepted registrations: {accepted}/{args.users}, users found: {found}/{args.users}, "
+              f"logins: {logged_in}/{len(checked)}, wrong passwords rejected: {rejected}/{len(checked)}")
+        if accepted != args.users or found != args.users:
+            sys.exit("lost or duplicated writes detected")
+        if logged_in != len(checked) or rejected != len(checked):
+            sys.exit("password checks gave wrong results")
+
+
+if __name__ == "__main__":
+    main()
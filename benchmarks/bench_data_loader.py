@@ -0,0 +1,70 @@
+# Benchmark: cold vs warm render of the Home page with the cached GDP loader.
+# "Cold" drops every process-wide cache first (dataset, aggregates, figures), so it
+# times a first page render after startup; "warm" is the next render of the same page.
+# Run from anywhere:  python benchmarks/bench_data_loader.py [--runs N]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+import aggregates
+import data_loader
+from figure_cache import figure_cache
+
+
+# Function to render the Home page once as a logged-in user and time it
+def render_home():
+    at = AppTest.from_file("App1.py", default_timeout=60)
+    at.session_state["authenticated"] = True
+    at.session_state["name"] = "Benchmark"
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed
+
+
+# Function to drop the dataset, aggregates and figure caches, as in a fresh process
+def clear_caches():
+    data_loader.clear_cache()
+    aggregates._aggregates.clear()
+    figure_cache.clear()
+
+
+# Function to time a single call
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs warm Home page render time")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    render_home()  # warm up imports so they are not counted as "cold"
+
+    cold, warm = [], []
+    for _ in range(args.runs):
+        clear_caches()
+        cold.append(render_home())
+        warm.append(render_home())
+
+    for label, samples in (("cold", cold), ("warm", warm)):
+        print(f"{label}: median {statistics.median(samples) * 1000:.1f} ms, "
+              f"min {min(samples) * 1000:.1f} ms over {len(samples)} runs")
+    print(f"load_gdp_data cold: {timed(lambda: (data_loader.clear_cache(), data_loader.load_gdp_data())) * 1000:.2f} ms, "
+          f"warm: {timed(data_loader.load_gdp_data) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
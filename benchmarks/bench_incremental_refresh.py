@@ -0,0 +1,73 @@
+# Benchmark: picking up appended rows (incremental merge) vs re-reading the whole dataset.
+# Run from anywhere:  python benchmarks/bench_incremental_refresh.py [--scale N] [--append-rows N]
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import aggregates
+import data_loader
+from load_test import write_synthetic_dataset
+
+
+# Function to time one call; returns (result, seconds)
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs full refresh after rows are appended")
+    parser.add_argument("--scale", type=int, default=100, help="dataset multiplier (see load_test.py)")
+    parser.add_argument("--append-rows", type=int, default=200, help="rows appended per refresh")
+    parser.add_argument("--parquet", action="store_true", help="append partition files to a Parquet copy")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gdp-refresh-")
+    try:
+        rows = write_synthetic_dataset(workdir, args.scale)
+        csv_path = os.path.join(workdir, "gdp_dataset.csv")
+        with open(csv_path, "rb") as csv_file:
+            header, *lines = csv_file.read().splitlines(keepends=True)
+        # The rows "appended later": the last ones of the synthetic file
+        base, extra = lines[:-args.append_rows], lines[-args.append_rows:]
+        with open(csv_path, "wb") as csv_file:
+            csv_file.write(header + b"".join(base))
+        path = csv_path
+        if args.parquet:
+            path = os.path.join(workdir, "gdp_parquet")
+            data_loader.convert_csv_to_parquet(csv_path, path)
+        aggregates.get_aggregates(path)
+
+        # Incremental: append, then refresh through the cached frame and aggregates
+        extra_path = os.path.join(workdir, "extra.csv")
+        with open(extra_path, "wb") as extra_file:
+            extra_file.write(header + b"".join(extra))
+        if args.parquet:
+            data_loader.append_csv_to_parquet(extra_path, path)
+        else:
+            with open(csv_path, "ab") as csv_file:
+                csv_file.write(b"".join(extra))
+        merged, incremental = timed(aggregates.get_aggregates, path)
+
+        # Full: drop the caches and read and aggregate everything again
+        data_loader.clear_cache()
+        aggregates._aggregates.clear()
+        rebuilt, full = timed(aggregates.get_aggregates, path)
+        assert merged.version == rebuilt.version and len(merged.gdp_data) == len(rebuilt.gdp_data)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    source = "Parquet" if args.parquet else "CSV"
+    print(f"{source}, {rows:,} rows, {args.append_rows} appended: incremental refresh {incremental * 1000:.0f} ms, "
+          f"full reload {full * 1000:.0f} ms ({full / incremental:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
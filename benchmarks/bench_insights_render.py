@@ -0,0 +1,59 @@
+# Benchmark: Insights & Analysis server render time and chart payload size.
+# Run from anywhere:  python benchmarks/bench_insights_render.py [--runs N] [--all-charts]
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+from figure_cache import figure_cache
+
+
+# Function to open the Insights page in a fresh session; returns (seconds, charts, payload bytes)
+def render_insights(all_charts):
+    at = AppTest.from_file("App1.py", default_timeout=120)
+    at.session_state["authenticated"] = True
+    at.session_state["name"] = "Benchmark"
+    at.run()
+    at.sidebar.radio[0].set_value("Insights & Analysis")
+    at.run()
+    if all_charts and at.multiselect:
+        # Pick every chart, then time the rerun that renders them
+        at.multiselect[0].set_value(at.multiselect[0].options)
+        figure_cache.clear()
+    else:
+        figure_cache.clear()
+        at.sidebar.radio[0].set_value("Home")
+        at.run()
+        at.sidebar.radio[0].set_value("Insights & Analysis")
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    charts = at.get("plotly_chart")
+    return elapsed, len(charts), sum(len(chart.proto.figure.spec) for chart in charts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Insights page render time and payload")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--all-charts", action="store_true", help="select every chart in the picker")
+    args = parser.parse_args()
+
+    render_insights(args.all_charts)  # warm up imports and data caches
+    results = [render_insights(args.all_charts) for _ in range(args.runs)]
+    times = [elapsed for elapsed, _, _ in results]
+    _, charts, payload = results[-1]
+    print(f"Insights render (figure cache cold): median {statistics.median(times) * 1000:.0f} ms, "
+          f"{charts} charts, {payload / 1024:.1f} KiB of figure JSON")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Benchmark: password verification throughput through the hashing worker pool.
+# Run from anywhere:  python benchmarks/bench_passwords.py [--logins N] [--threads N]
+import argparse
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import passwords
+
+
+# Function to run check_password for every (password, stored) pair from many threads at once
+def run(label, pairs, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as sessions:
+        results = list(sessions.map(lambda pair: passwords.check_password(*pair), pairs))
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {len(pairs)} checks in {elapsed:.2f} s, {len(pairs) / elapsed:,.1f} checks/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Password verification throughput")
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=32, help="concurrent sessions")
+    args = parser.parse_args()
+    print(f"hash worker pool: {passwords.HASH_WORKERS} threads, "
+          f"pbkdf2_sha256 with {passwords.PBKDF2_ITERATIONS:,} iterations")
+
+    secrets_ = [f"password-{i}" for i in range(args.logins)]
+    legacy = [(secret, hashlib.sha256(secret.encode()).hexdigest()) for secret in secrets_]
+    start = time.perf_counter()
+    salted = [(secret, passwords.hash_password(secret)) for secret in secrets_]
+    print(f"hash_password: {args.logins / (time.perf_counter() - start):,.1f} hashes/s (single thread)")
+
+    run("legacy sha256 (incl. upgrade)", legacy, args.threads)
+    run("pbkdf2 cold", salted, args.threads)
+    run("pbkdf2 memoized", salted, args.threads)
+    run("unknown user", [(secret, None) for secret in secrets_], args.threads)
+    results = run("wrong password", [(secret + "x", stored) for secret, stored in salted], args.threads)
+    assert not any(ok for ok, _ in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Benchmark: memory per worker process with private dataset copies vs the shared,
+# memory-mapped dataset (see shared_dataset.py). Linux only (reads /proc/self/smaps_rollup).
+# Run from anywhere:  python benchmarks/bench_shared_memory.py [--scale N] [--workers N]
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from load_test import copy_app, write_synthetic_dataset
+
+
+# Function to read this process's memory counters in KiB (Rss, Pss, Private)
+def memory_kib():
+    counters = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                counters[name] = int(value.split()[0])
+    return {"rss": counters["Rss"], "pss": counters["Pss"],
+            "private": counters["Private_Clean"] + counters["Private_Dirty"]}
+
+
+# Function run in each worker: load the dataset, aggregates, KPIs and rankings like an app process would
+def worker(workdir, loaded, measured, results):
+    os.chdir(workdir)
+    sys.path.insert(0, workdir)
+    import aggregates
+    import kpis
+    import rankings
+
+    before = memory_kib()
+    aggregates.get_aggregates()
+    kpis.get_kpis()
+    rankings.get_rankings()
+    loaded.wait()  # every worker has its data before anyone measures
+    after = memory_kib()
+    results.put({name: after[name] - before[name] for name in after} | {"pss_total": after["pss"]})
+    measured.wait()
+
+
+# Function to start the workers in one mode and collect their memory deltas
+def run_mode(workdir, workers):
+    context = multiprocessing.get_context("spawn")
+    loaded, measured = context.Barrier(workers), context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(workdir, loaded, measured, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-worker memory: private dataset copies vs shared mapping")
+    parser.add_argument("--scale", type=int, default=100, help="dataset multiplier (see load_test.py)")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gdp-shared-")
+    try:
+        # The whole app, so every module the workers import comes from the copy
+        copy_app(workdir)
+        rows = write_synthetic_dataset(workdir, args.scale)
+        private = run_mode(workdir, args.workers)
+
+        os.chdir(workdir)
+        sys.path.insert(0, workdir)
+        from shared_dataset import publish_shared_dataset
+        publish_shared_dataset()
+        shared = run_mode(workdir, args.workers)
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{rows:,} rows, {args.workers} workers (memory added by loading data, per worker):")
+    for label, samples in (("private copies", private), ("shared mapping", shared)):
+        mean = {name: sum(sample[name] for sample in samples) / len(samples) / 1024 for name in samples[0]}
+        print(f"  {label}: private {mean['private']:.1f} MiB, PSS {mean['pss']:.1f} MiB, RSS {mean['rss']:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# Multi-session load test for App1.py, built on Streamlit's AppTest.
+#
+# Every simulated user logs in through the real form, then clicks through
+# pages and the Insights filters. The dataset is a synthetic copy of
+# gdp_dataset.csv with the city list repeated `scale` times.
+#
+# AppTest is not thread-safe, so concurrency is modelled the way a server
+# process sees it: each worker process hosts users/workers sessions and
+# steps them round-robin, sharing that process's data and figure caches.
+#
+#   python benchmarks/load_test.py --scales 10,100 --users 50 --workers 4 --save
+#   python benchmarks/load_test.py --scales 10 --compare benchmarks/results/<file>.json
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+PASSWORD = "load-test-password"
+PAGES = ["Home", "About", "Dashboard", "Insights & Analysis", "Feedback"]
+
+
+# Function to write a copy of the GDP data (and coordinates) with every city repeated `scale` times
+def write_synthetic_dataset(workdir, scale, seed=0):
+    rng = np.random.default_rng(seed)
+    base = pd.read_csv(os.path.join(ROOT, "gdp_dataset.csv")).dropna(subset=["City", "Year"])
+    coords = pd.read_csv(os.path.join(ROOT, "city_coords.csv")).set_index("City")
+    frames, coord_frames = [], []
+    for copy in range(scale):
+        frame = base.copy()
+        if copy:
+            frame["City"] = frame["City"] + f" {copy + 1}"
+            metrics = frame.columns.drop(["City", "Year", "Population"])
+            frame[metrics] = (frame[metrics] * rng.uniform(0.9, 1.1, size=(len(frame), len(metrics)))).round(2)
+        frames.append(frame)
+        copy_coords = coords.copy()
+        copy_coords.index = copy_coords.index + ("" if copy == 0 else f" {copy + 1}")
+        copy_coords[["Latitude", "Longitude"]] += rng.uniform(-0.5, 0.5, size=(len(copy_coords), 2)) * (copy > 0)
+        coord_frames.append(copy_coords)
+    synthetic = pd.concat(frames, ignore_index=True)
+    synthetic["Year"] = synthetic["Year"].astype(int)
+    synthetic["Population"] = synthetic["Population"].astype(int)
+    synthetic.to_csv(os.path.join(workdir, "gdp_dataset.csv"), index=False)
+    pd.concat(coord_frames).reset_index().to_csv(os.path.join(workdir, "city_coords.csv"), index=False)
+    return len(synthetic)
+
+
+# Function to copy the app (without local data, logs or accounts) into a scratch directory
+def copy_app(workdir):
+    shutil.copytree(ROOT, workdir, dirs_exist_ok=True, ignore=shutil.ignore_patterns(
+        ".git", "benchmarks", "__pycache__", "gdp_parquet", "*.arrow", "*.db", "*.db-*", "*.jsonl*", "logged_in_users.csv"))
+
+
+# Function to register one account per simulated user (hashing on every core)
+def create_accounts(workdir, users):
+    import credentials
+    import passwords
+    db_path = os.path.join(workdir, credentials.CREDENTIALS_DB)
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as pool:
+        hashes = list(pool.map(passwords.hash_password, [PASSWORD] * users))
+    for index, password_hash in enumerate(hashes):
+        credentials.add_user(f"User {index}", f"user{index}", password_hash, db_path)
+
+
+# One simulated user: an AppTest session plus its scripted next step
+class Session:
+    def __init__(self, app_path, username, rng):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(app_path, default_timeout=600)
+        self.username = username
+        self.rng = rng
+        self.logged_in = False
+
+    # Function to run one scripted action; returns (action name, seconds)
+    def step(self):
+        app = self.app
+        if not self.logged_in:
+            if not app.text_input:
+                return "open", self._run()
+            app.text_input[0].set_value(self.username)
+            app.text_input[1].set_value(PASSWORD)
+            app.button[0].click()
+            self.logged_in = True
+            return "login", self._run()
+
+        on_insights = app.sidebar.radio and app.sidebar.radio[0].value == "Insights & Analysis"
+        action = self.rng.choice(["page", "year", "city", "charts"] if on_insights else ["page"])
+        if action == "page":
+            page = self.rng.choice(PAGES)
+            app.sidebar.radio[0].set_value(page)
+            return f"page:{page}", self._run()
+        if action == "charts":
+            options = app.multiselect[0].options
+            app.multiselect[0].set_value(self.rng.sample(options, self.rng.randint(1, 3)))
+            return "charts", self._run()
+        box = app.selectbox[0 if action == "year" else 1]
+        box.set_value(self.rng.choice(box.options))
+        return action, self._run()
+
+    # Function to rerun the script and time it
+    def _run(self):
+        start = time.perf_counter()
+        self.app.run()
+        elapsed = time.perf_counter() - start
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].value)
+        return elapsed
+
+
+# Function run in each worker process: step its sessions round-robin and report timings
+def run_worker(workdir, first_user, users, steps, seed):
+    os.chdir(workdir)
+    sys.path.insert(0, workdir)
+    rng = random.Random(seed)
+    app_path = os.path.join(workdir, "App1.py")
+    sessions = [Session(app_path, f"user{first_user + index}", random.Random(rng.random())) for index in range(users)]
+    latencies, errors = {}, []
+    start = time.perf_counter()
+    for _ in range(steps):
+        for session in sessions:
+            try:
+                action, elapsed = session.step()
+            except Exception as error:
+                errors.append(str(error))
+                continue
+            latencies.setdefault(action, []).append(elapsed)
+    wall = time.perf_counter() - start
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+    return {"latencies": latencies, "errors": errors, "wall": wall, "peak_rss_kb": peak_rss_kb}
+
+
+# Function to get p50/p95 in milliseconds
+def percentiles(values):
+    values = sorted(values)
+    if len(values) == 1:
+        return {"p50_ms": values[0] * 1000, "p95_ms": values[0] * 1000}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50_ms": cuts[49] * 1000, "p95_ms": cuts[94] * 1000}
+
+
+# Function to run one (scale, users) configuration in fresh worker processes
+def run_config(scale, users, workers, steps, seed):
+    workdir = tempfile.mkdtemp(prefix=f"gdp-load-{scale}x-")
+    try:
+        copy_app(workdir)
+        rows = write_synthetic_dataset(workdir, scale, seed)
+        create_accounts(workdir, users)
+        workers = max(1, min(workers, users))
+        shares = [users // workers + (index < users % workers) for index in range(workers)]
+        starts = [sum(shares[:index]) for index in range(workers)]
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(workers) as pool:
+            results = pool.starmap(run_worker, [(workdir, starts[index], shares[index], steps, seed + index)
+                                                for index in range(workers)])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    latencies = {}
+    for result in results:
+        for action, values in result["latencies"].items():
+            latencies.setdefault(action, []).extend(values)
+    every_rerun = [value for values in latencies.values() for value in values]
+    wall = max(result["wall"] for result in results)
+    rss = [result["peak_rss_kb"] for result in results if result["peak_rss_kb"] is not None]
+    return {
+        "scale": scale, "rows": rows, "users": users, "workers": workers, "steps": steps,
+        "reruns": len(every_rerun), "errors": sum(len(result["errors"]) for result in results),
+        "error_samples": sorted({error for result in results for error in result["errors"]})[:5],
+        "throughput_rps": len(every_rerun) / wall if wall else 0.0,
+        **percentiles(every_rerun),
+        "peak_rss_mb_max": max(rss) / 1024 if rss else None,
+        "peak_rss_mb_total": sum(rss) / 1024 if rss else None,
+        "actions": {action: {"count": len(values), **percentiles(values)} for action, values in sorted(latencies.items())},
+    }
+
+
+# Function to get the current commit, to label saved results
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# Function to print one result line, with the change against a baseline result if given
+def print_result(result, baseline=None):
+    line = (f"scale {result['scale']:>4}x ({result['rows']:,} rows), {result['users']} users: "
+            f"p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms, "
+            f"{result['throughput_rps']:.1f} reruns/s, peak RSS {result['peak_rss_mb_max'] or 0:.0f} MB/worker, "
+            f"{result['errors']} errors")
+    print(line)
+    if baseline is not None:
+        changes = []
+        for key in ("p50_ms", "p95_ms", "throughput_rps", "peak_rss_mb_max"):
+            if baseline.get(key):
+                changes.append(f"{key} {100 * (result[key] - baseline[key]) / baseline[key]:+.1f}%")
+        print("    vs baseline: " + ", ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session load test for App1.py")
+    parser.add_argument("--scales", default="10", help="comma-separated dataset multipliers, e.g. 10,100,1000")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--steps", type=int, default=10, help="actions per user after opening the app")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", action="store_true", help=f"write results to {os.path.relpath(RESULTS_DIR, ROOT)}/")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = {(run["scale"], run["users"]): run for run in json.load(baseline_file)["runs"]}
+
+    runs = []
+    for scale in (int(value) for value in args.scales.split(",")):
+        # +2 steps: opening the app and logging in
+        result = run_config(scale, args.users, args.workers, args.steps + 2, args.seed)
+        print_result(result, baseline.get((scale, args.users)))
+        runs.append(result)
+
+    if args.save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        commit = git_commit()
+        path = os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+        with open(path, "w") as results_file:
+            json.dump({"commit": commit, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "runs": runs}, results_file, indent=2)
+        print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import pandas as pd
+import plotly.express as px
+
+from aggregates import SECTORS
+from figure_cache import cached_figure
+from geo import add_coordinates, get_coords_version, load_city_coords
+from point_budget import OTHER_LABEL, fit_point_budget
+
+
+# --- Home page charts ---
+
+# Function to build the national GDP trend line
+def national_gdp_trend(aggregates, city=None, year=None):
+    first, last = aggregates.years[0], aggregates.years[-1]
+    fig = px.line(aggregates.national_trend, x="Year", y="GDP (in billion $)", markers=True,
+                  title=f"GDP Trend ({first}-{last})" if last != first else f"GDP Trend ({first})")
+    fig.update_traces(line=dict(width=3))
+    return fig
+
+
+# Function to build the average sector breakdown pie
+def national_sector_pie(aggregates, city=None, year=None):
+    return px.pie(aggregates.sector_mean, names="Sector", values="Percentage", title="Sector-wise GDP Breakdown")
+
+
+# --- Insights & Analysis charts ---
+
+# Function to build a city's GDP trend line
+def city_gdp_trend(aggregates, city, year=None):
+    gdp_trend = aggregates.city_trend(city, ["GDP (in billion $)"])
+    return px.line(gdp_trend, x="Year", y="GDP (in billion $)", markers=True, title=f"GDP Growth Trend in {city}")
+
+
+# Function to add the point-budget note under a chart title
+def _budget_title(title, note):
+    return title if note is None else f"{title}<br><sup>{note}</sup>"
+
+
+# Function to keep the budgeted legend in rank order, with "Other" last
+def _legend_order(points):
+    if isinstance(points["City"].dtype, pd.CategoricalDtype) and OTHER_LABEL in points["City"].cat.categories:
+        return {"City": list(points["City"].cat.categories)}
+    return None
+
+
+# Function to build the all-city GDP vs unemployment scatter
+def gdp_vs_unemployment(aggregates, city=None, year=None):
+    points, note = fit_point_budget(aggregates.gdp_data, ["GDP (in billion $)", "Unemployment Rate (%)"], "GDP (in billion $)")
+    if note is None:
+        return px.scatter(points, x="GDP (in billion $)", y="Unemployment Rate (%)", color="City", title="GDP vs Unemployment Rate")
+    return px.scatter(points, x="GDP (in billion $)", y="Unemployment Rate (%)", color="City", hover_name="City name",
+                      render_mode="webgl", category_orders=_legend_order(points), title=_budget_title("GDP vs Unemployment Rate", note))
+
+
+# Function to build the GDP map for one year
+def gdp_map(aggregates, city=None, year=None):
+    # Latitude and Longitude come from the city_coords.csv reference table (or the shared dataset)
+    map_data, _ = add_coordinates(aggregates.year_rows(year))
+    return px.scatter_geo(map_data,
+                          lat="Latitude",
+                          lon="Longitude",
+                          size="GDP (in billion $)",
+                          color="City",
+                          hover_name="City",
+                          title="GDP by City (Choropleth Map)")
+
+
+# Function to build a city's sector pie for one year
+def city_sector_pie(aggregates, city, year):
+    sector_data = aggregates.city_year_rows(city, year)[SECTORS].melt(var_name="Sector", value_name="Percentage")
+    return px.pie(sector_data, names="Sector", values="Percentage", title="Sector-wise GDP Breakdown")
+
+
+# Function to build the top 10 cities by GDP for one year
+def top_gdp_cities(aggregates, city=None, year=None):
+    top_cities = aggregates.top_cities(year, "GDP (in billion $)")
+    return px.bar(top_cities, x="City", y="GDP (in billion $)", title="Top 10 Cities by GDP")
+
+
+# Function to build the national GDP line for the global comparison
+def india_vs_global_gdp(aggregates, city=None, year=None):
+    return px.line(aggregates.national_trend, x="Year", y="GDP (in billion $)", title="India GDP vs Global GDP")
+
+
+# Function to build the city/sector treemap
+def city_sector_treemap(aggregates, city=None, year=None):
+    return px.treemap(aggregates.treemap_data, path=["City", "Sector"], values="Percentage",
+                      title="GDP Distribution by City and Sector")
+
+
+# Function to build a city's unemployment trend line
+def city_unemployment_trend(aggregates, city, year=None):
+    unemployment_trend = aggregates.city_trend(city, ["Unemployment Rate (%)"])
+    return px.line(unemployment_trend, x="Year", y="Unemployment Rate (%)", markers=True, title=f"Unemployment Rate Trends in {city}")
+
+
+# Function to build the GDP / R&D / population 3D scatter (3D traces always use WebGL)
+def gdp_rd_population_3d(aggregates, city=None, year=None):
+    points, note = fit_point_budget(aggregates.gdp_data, ["GDP (in billion $)", "R&D Expenditure (% of GDP)", "Population"],
+                                    "GDP (in billion $)")
+    return px.scatter_3d(points, x="GDP (in billion $)", y="R&D Expenditure (% of GDP)", z="Population",
+                         color="City", hover_name="City name" if note else None, category_orders=_legend_order(points),
+                         title=_budget_title("GDP vs R&D vs Population (3D Scatter Plot)", note))
+
+
+# Function to build the top 10 cities by patents for one year
+def top_patent_cities(aggregates, city=None, year=None):
+    top_cities = aggregates.top_cities(year, "Patents per 100,000 Inhabitants")
+    return px.bar(top_cities, x="City", y="Patents per 100,000 Inhabitants", title="Top 10 Cities by Patents")
+
+
+# Function to build a city's sector shares over time
+def city_sector_area(aggregates, city, year=None):
+    return px.area(aggregates.sector_trend(city), x="Year", y="Percentage", color="Sector", title="Sector-wise GDP Contribution Over Time")
+
+
+# Function to build a city's tourism employment trend line
+def city_tourism_trend(aggregates, city, year=None):
+    tourism_trend = aggregates.city_trend(city, ["Tourism Sector Employment (%)"])
+    return px.line(tourism_trend, x="Year", y="Tourism Sector Employment (%)", markers=True, title=f"Tourism Sector Employment Trends in {city}")
+
+
+# Function to build the GDP histogram for one year
+def gdp_histogram(aggregates, city=None, year=None):
+    return px.histogram(aggregates.year_rows(year), x="GDP (in billion $)", nbins=20,
+                        title="GDP Distribution Across Cities")
+
+
+# Function to build a city's sector polar chart for one year
+def city_sector_polar(aggregates, city, year):
+    sector_data = aggregates.city_year_rows(city, year)[SECTORS].melt(var_name="Sector", value_name="Percentage")
+    return px.line_polar(sector_data, r="Percentage", theta="Sector", line_close=True,
+                         title="Sector-wise GDP Contribution (Polar Chart)")
+
+
+# Sidebar name of the Insights & Analysis page (see app_pages.PAGES)
+INSIGHTS = "Insights & Analysis"
+
+# Chart registry: (sidebar page, chart) -> (builder, inputs the figure depends on).
+# "city" / "year" are the selected filters, "coords" the coordinates table version.
+CHARTS = {
+    ("Home", "gdp_trend"): (national_gdp_trend, ()),
+    ("Home", "sector_pie"): (national_sector_pie, ()),
+    (INSIGHTS, "gdp_trend"): (city_gdp_trend, ("city",)),
+    (INSIGHTS, "gdp_vs_unemployment"): (gdp_vs_unemployment, ()),
+    (INSIGHTS, "gdp_map"): (gdp_map, ("year", "coords")),
+    (INSIGHTS, "sector_pie"): (city_sector_pie, ("city", "year")),
+    (INSIGHTS, "top_gdp"): (top_gdp_cities, ("year",)),
+    (INSIGHTS, "india_vs_global"): (india_vs_global_gdp, ()),
+    (INSIGHTS, "treemap"): (city_sector_treemap, ()),
+    (INSIGHTS, "unemployment_trend"): (city_unemployment_trend, ("city",)),
+    (INSIGHTS, "scatter_3d"): (gdp_rd_population_3d, ()),
+    (INSIGHTS, "top_patents"): (top_patent_cities, ("year",)),
+    (INSIGHTS, "sector_area"): (city_sector_area, ("city",)),
+    (INSIGHTS, "tourism_trend"): (city_tourism_trend, ("city",)),
+    (INSIGHTS, "gdp_histogram"): (gdp_histogram, ("year",)),
+    (INSIGHTS, "sector_polar"): (city_sector_polar, ("city", "year")),
+}
+
+
+# Function to get a chart's figure through the shared figure cache
+def get_figure(page, chart, aggregates, city=None, year=None):
+    builder, depends_on = CHARTS[(page, chart)]
+    inputs = {"city": city, "year": None if year is None else int(year)}
+    filters = tuple(get_coords_version() if name == "coords" else inputs[name] for name in depends_on)
+    return cached_figure(page, chart, filters, aggregates.version,
+                         lambda: builder(aggregates, inputs["city"], inputs["year"]))
+
+
+# Function to list the cities in the data that cannot be placed on the map
+def unmapped_cities(aggregates):
+    gdp_data = aggregates.gdp_data
+    if "Latitude" in gdp_data.columns:
+        # The shared dataset carries the coordinates it was published with
+        return sorted(set(gdp_data.loc[gdp_data["Latitude"].isna(), "City"].astype(str)))
+    known = load_city_coords().dropna().index
+    return [city for city in aggregates.cities if city not in known]
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Helpers shared by the tables derived per (City, Year) from the GDP dataset: the chart
+# aggregates (aggregates.py), the Dashboard KPIs (kpis.py) and the rankings (rankings.py).
+# Those tables keep City categorical and their rows sorted by (City code, Year).
+
+
+# Dataset columns city_year_totals reads, so the KPIs and rankings load only those
+TOTALS_COLUMNS = ["City", "Year", "GDP (in billion $)", "Industry (%)", "R&D Expenditure (% of GDP)",
+                  "Patents per 100,000 Inhabitants", "Unemployment Rate (%)", "Population"]
+
+
+# Function to sum the inputs of the KPIs and rankings per (city, year) in one groupby:
+# GDP, industrial output, R&D spend, patents and unemployed people, plus the population
+def city_year_totals(gdp_data):
+    gdp = gdp_data["GDP (in billion $)"].astype("float64")
+    population = gdp_data["Population"].astype("float64")
+    inputs = pd.DataFrame({
+        "City": gdp_data["City"],
+        "Year": gdp_data["Year"],
+        "gdp": gdp,
+        "industry": gdp * gdp_data["Industry (%)"].astype("float64") / 100,
+        "rd_spend": gdp * gdp_data["R&D Expenditure (% of GDP)"].astype("float64") / 100,
+        "patent_count": population * gdp_data["Patents per 100,000 Inhabitants"].astype("float64") / 100_000,
+        "unemployed": population * gdp_data["Unemployment Rate (%)"].astype("float64") / 100,
+        "population": population,
+    })
+    return inputs.groupby(["City", "Year"], observed=True).sum().reset_index()
+
+
+# Function to get the cities that rows appended to gdp_data (from first_new_row on) touch,
+# and every row of those cities: (cities, rows)
+def touched_cities(gdp_data, first_new_row):
+    cities = gdp_data["City"].iloc[first_new_row:].unique()
+    return cities, gdp_data[gdp_data["City"].isin(cities)]
+
+
+# Function to replace the rows of some cities in a per-city table with recomputed ones.
+# Cities only gain categories at the end, so the kept rows keep their codes. The result is
+# sorted by (City code, Year) again.
+def replace_city_rows(table, city_rows):
+    kept = table[~table["City"].isin(city_rows["City"].unique())]
+    kept = kept.assign(City=kept["City"].cat.set_categories(city_rows["City"].cat.categories))
+    return pd.concat([kept, city_rows]).sort_values(["City", "Year"], ignore_index=True)
+
+
+# Binary-search index over a table sorted by (City code, Year)
+class CityYearIndex:
+    def __init__(self, table):
+        self._categories = table["City"].cat.categories
+        self._codes = table["City"].cat.codes.to_numpy()
+        self._years = table["Year"].to_numpy()
+
+    # Function to find a city's rows: (first, last), empty for a city not in the table
+    def span(self, city):
+        if city not in self._categories:
+            return 0, 0
+        code = self._categories.get_loc(city)
+        first, last = np.searchsorted(self._codes, [code, code + 1])
+        return int(first), int(last)
+
+    # Function to find the row of a city in a year (None if there is none)
+    def row(self, city, year):
+        first, last = self.span(city)
+        index = first + int(np.searchsorted(self._years[first:last], int(year)))
+        return index if index < last and self._years[index] == int(year) else None
+
+    # Function to list the years a city has rows in
+    def years(self, city):
+        first, last = self.span(city)
+        return [int(year) for year in self._years[first:last]]
@@ -0,0 +1,99 @@
+import csv
+import os
+import sqlite3
+import threading
+
+# SQLite store for user accounts, and the CSV file it replaces
+CREDENTIALS_DB = "user_credentials.db"
+LEGACY_CREDENTIALS_FILE = "user_credentials.csv"
+
+# Bumped whenever the schema changes (stored in PRAGMA user_version)
+SCHEMA_VERSION = 1
+
+# Streamlit runs every session in its own thread, and sqlite connections
+# must stay on the thread that opened them, so keep one per thread and path
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+# Function to open (or reuse) this thread's connection to the store
+def _connect(db_path):
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        connections[db_path] = conn
+    if db_path not in _initialized:
+        _init_db(conn, db_path)
+    return conn
+
+
+# Function to create the schema and import the legacy CSV, once per database
+def _init_db(conn, db_path):
+    with _init_lock:
+        if db_path in _initialized:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                # username is the primary key, so lookups go through its B-tree index
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS users ("
+                    " username TEXT PRIMARY KEY,"
+                    " name TEXT NOT NULL,"
+                    " password TEXT NOT NULL)"
+                )
+                _migrate_csv(conn, os.path.join(os.path.dirname(db_path), LEGACY_CREDENTIALS_FILE))
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        _initialized.add(db_path)
+
+
+# Function to copy users from the old user_credentials.csv (first entry wins, like the old lookup)
+def _migrate_csv(conn, csv_path):
+    if not os.path.exists(csv_path):
+        return
+    with open(csv_path, newline="", encoding="utf-8") as csv_file:
+        rows = [(row["username"], row["name"], row["password"])
+                for row in csv.DictReader(csv_file) if row.get("username")]
+    conn.executemany("INSERT OR IGNORE INTO users (username, name, password) VALUES (?, ?, ?)", rows)
+
+
+# Function to get a user as a dict with name, username and password, or None
+def get_user(username, db_path=CREDENTIALS_DB):
+    row = _connect(db_path).execute(
+        "SELECT name, username, password FROM users WHERE username = ?", (username,)
+    ).fetchone()
+    return None if row is None else dict(row)
+
+
+# Function to check if a username is taken
+def user_exists(username, db_path=CREDENTIALS_DB):
+    row = _connect(db_path).execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone()
+    return row is not None
+
+
+# Function to add a user; returns False if the username is already taken.
+# The insert is a single atomic statement, so concurrent registrations cannot overwrite each other.
+def add_user(name, username, password_hash, db_path=CREDENTIALS_DB):
+    try:
+        _connect(db_path).execute(
+            "INSERT INTO users (username, name, password) VALUES (?, ?, ?)", (username, name, password_hash)
+        )
+    except sqlite3.IntegrityError:
+        return False
+    return True
+
+
+# Function to replace a user's stored password hash
+def update_password(username, password_hash, db_path=CREDENTIALS_DB):
+    _connect(db_path).execute("UPDATE users SET password = ? WHERE username = ?", (password_hash, username))
@@ -0,0 +1,543 @@
+import argparse
+import hashlib
+import io
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# Default GDP dataset.
+# If the columnar copy (see convert_csv_to_parquet) exists, it is used instead of the CSV,
+# and if a shared copy has been published (see shared_dataset.py), that is used first.
+GDP_FILE = "gdp_dataset.csv"
+GDP_PARQUET_DIR = "gdp_parquet"
+GDP_SHARED_FILE = "gdp_shared.arrow"
+
+# A year window of "the N most recent years in the data"
+LatestYears = namedtuple("LatestYears", "count")
+
+logger = logging.getLogger(__name__)
+
+
+# Function to parse a year window: a range ("2019-2023"), a list ("2019,2021"),
+# "latest:N" for the N most recent years in the data, or "all" (None)
+def parse_year_window(spec):
+    spec = spec.strip().lower()
+    try:
+        if spec in ("", "all"):
+            return None
+        if spec.startswith("latest:"):
+            return LatestYears(int(spec[len("latest:"):]))
+        if "-" in spec:
+            first, last = spec.split("-")
+            return tuple(range(int(first), int(last) + 1))
+        return tuple(int(year) for year in spec.split(","))
+    except ValueError:
+        raise ValueError(f"invalid year window {spec!r}: use e.g. 2019-2023, 2019,2021, latest:5 or all")
+
+
+# Years shown in the dashboard, from GDP_YEARS (default 2019-2023)
+YEAR_WINDOW = os.environ.get("GDP_YEARS", "2019-2023")
+YEARS = parse_year_window(YEAR_WINDOW)
+
+# Compact column types for the GDP dataset
+GDP_DTYPES = {
+    "City": "category",
+    "Year": "int16",
+    "R&D Expenditure (% of GDP)": "float32",
+    "Patents per 100,000 Inhabitants": "float32",
+    "Unemployment Rate (%)": "float32",
+    "Youth Unemployment Rate (%)": "float32",
+    "SME Employment (%)": "float32",
+    "Tourism Sector Employment (%)": "float32",
+    "ICT Sector Employment (%)": "float32",
+    "GDP (in billion $)": "float32",
+    "Agriculture (%)": "float32",
+    "Industry (%)": "float32",
+    "Services (%)": "float32",
+    "Technology (%)": "float32",
+    "Population": "int32",
+}
+
+# One cache per process, shared by every session:
+# (path, reader, query) -> (stamp, version, frame, {earlier version: row where its data ends})
+_cache = {}
+# Earlier versions remembered per entry, for callers catching up on appended rows
+MAX_APPENDED_VERSIONS = 8
+# Partition files pyarrow keeps open at once while writing a dataset
+MAX_OPEN_FILES = 512
+_cache_lock = threading.Lock()
+
+
+# Function to list (relative path, mtime, size) for a file, or for every file under a directory
+def _file_listing(path):
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return [("", stat.st_mtime_ns, stat.st_size)]
+    listing = []
+    for folder, _, files in os.walk(path):
+        for name in files:
+            stat = os.stat(os.path.join(folder, name))
+            listing.append((os.path.relpath(os.path.join(folder, name), path), stat.st_mtime_ns, stat.st_size))
+    return sorted(listing)
+
+
+# Seconds a Parquet dataset's file listing is reused before listing it again
+# (GDP_DATASET_CHECK_INTERVAL). Listing stats every partition file, which with thousands
+# of partitions costs far more than the cached load itself, so it is not redone on every
+# call. A single file is one stat and is always checked.
+DATASET_CHECK_INTERVAL = float(os.environ.get("GDP_DATASET_CHECK_INTERVAL", "5"))
+# directory -> (time listed, stamp)
+_listings = {}
+
+
+# Function to get a cheap change marker for a file or dataset directory: its file listing.
+# A directory's listing is reused for max_age seconds.
+def _file_stamp(path, max_age=DATASET_CHECK_INTERVAL):
+    if not os.path.isdir(path):
+        return tuple(_file_listing(path))
+    key = os.path.abspath(path)
+    listed = _listings.get(key)
+    now = time.monotonic()
+    if listed is not None and now - listed[0] < max_age:
+        return listed[1]
+    stamp = tuple(_file_listing(path))
+    _listings[key] = (now, stamp)
+    return stamp
+
+
+# Function to hash a file's contents (or a directory's file listing, default: listed now)
+# into a short dataset version
+def _file_hash(path, listing=None):
+    digest = hashlib.sha1()
+    if os.path.isdir(path):
+        # Partition files are rewritten as a whole, so their names, sizes and times identify the data
+        digest.update(repr(list(_file_listing(path) if listing is None else listing)).encode())
+        return digest.hexdigest()[:12]
+    with open(path, "rb") as data_file:
+        for chunk in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+# Function to hash file contents already in memory (same version as _file_hash)
+def _hash_bytes(content):
+    return hashlib.sha1(content).hexdigest()[:12]
+
+
+# Integer columns are parsed as float first: the CSV ends with blank rows
+_INT_COLUMNS = [column for column, dtype in GDP_DTYPES.items() if dtype.startswith("int")]
+
+
+# Function to give every loaded column its compact type, whatever the source
+def _apply_dtypes(gdp_data):
+    gdp_data = gdp_data.astype({column: GDP_DTYPES[column] for column in gdp_data.columns if column in GDP_DTYPES})
+    if "City" in gdp_data.columns:
+        gdp_data["City"] = gdp_data["City"].cat.remove_unused_categories()
+    return gdp_data.reset_index(drop=True)
+
+
+# Function to get the years of a window present in the data
+def _window_years(years, available):
+    if isinstance(years, LatestYears):
+        return sorted(int(year) for year in pd.unique(np.asarray(available)))[-years.count:] if years.count > 0 else []
+    return years
+
+
+# Function to filter parsed GDP rows by year window and cities, keeping the given columns
+def _filter_gdp(gdp_data, columns=None, years=None, cities=None):
+    if years is not None:
+        gdp_data = gdp_data[gdp_data["Year"].isin(_window_years(years, gdp_data["Year"]))]
+    if cities is not None:
+        gdp_data = gdp_data[gdp_data["City"].isin(cities)]
+    if columns is not None:
+        gdp_data = gdp_data[list(columns)]
+    return _apply_dtypes(gdp_data)
+
+
+# Function to list the columns to read: the wanted ones plus City and Year for filtering
+def _read_columns(columns):
+    return None if columns is None else list(dict.fromkeys(["City", "Year"] + list(columns)))
+
+
+# Function to parse GDP CSV text from a path or buffer (blank rows dropped, nothing filtered)
+def _parse_gdp_csv(source, columns=None):
+    read_dtypes = {column: ("float64" if column in _INT_COLUMNS else dtype) for column, dtype in GDP_DTYPES.items()}
+    gdp_data = pd.read_csv(source, dtype=read_dtypes, usecols=_read_columns(columns))
+    return gdp_data.dropna(subset=["City", "Year"])
+
+
+# Function to parse and filter the GDP CSV (text has no pushdown: parse, then filter)
+def _read_gdp_csv(path, columns=None, years=None, cities=None):
+    return _filter_gdp(_parse_gdp_csv(path, columns), columns, years, cities)
+
+
+# Function to get the data files of a dataset directory listing, as paths. Same rule as
+# pyarrow's directory discovery: hidden and "_" files are not data.
+def _data_files(path, listing):
+    return [os.path.join(path, name) for name, *_ in listing if not os.path.basename(name).startswith((".", "_"))]
+
+
+# Function to read a Parquet dataset, pushing the column, year and city filters
+# down to pyarrow so unneeded partitions and columns are never read.
+# With a listing (see _file_listing), exactly the files in it are read, so the rows
+# match that listing even if files are added while they are read.
+def _read_gdp_parquet(path, columns=None, years=None, cities=None, listing=None):
+    import pyarrow.dataset as ds
+
+    if listing is None:
+        dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    else:
+        dataset = ds.dataset(_data_files(path, listing), format="parquet", partitioning="hive",
+                             partition_base_dir=path)
+    if isinstance(years, LatestYears):
+        # Year is a partition column, so this reads no data pages
+        years = _window_years(years, dataset.to_table(columns=["Year"]).column("Year").to_numpy())
+    condition = None
+    if years is not None:
+        condition = ds.field("Year").isin(list(years))
+    if cities is not None:
+        city_condition = ds.field("City").isin(list(cities))
+        condition = city_condition if condition is None else condition & city_condition
+    table = dataset.to_table(columns=None if columns is None else list(columns), filter=condition)
+    gdp_data = table.to_pandas()
+    if columns is None:
+        # Partition columns come back last; restore the CSV column order
+        gdp_data = gdp_data[[column for column in GDP_DTYPES if column in gdp_data.columns]
+                            + [column for column in gdp_data.columns if column not in GDP_DTYPES]]
+    return _apply_dtypes(gdp_data)
+
+
+# Function to tell whether two parsed year windows select the same years
+def _same_window(window, other):
+    if isinstance(window, tuple) and isinstance(other, tuple) and not isinstance(window, LatestYears):
+        return sorted(window) == sorted(other)
+    return window == other
+
+
+# Function to map a published Arrow file (see shared_dataset.py) read-only. The frame's
+# columns point straight into the mapping, so every process on the host shares one copy
+# through the page cache. The arrays are read-only: code that tries to modify the frame
+# fails instead of quietly copying it. Queries narrower than what was published get a
+# private filtered copy.
+def _read_gdp_arrow(path, columns=None, years=None, cities=None):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+    published_years = pd.unique(table.column("Year").to_numpy())
+    shared = cities is None and (years is None or set(published_years) <= set(_window_years(years, published_years)))
+    published_window = (table.schema.metadata or {}).get(b"gdp_year_window")
+    if published_window is not None and not _same_window(parse_year_window(published_window.decode()), years):
+        logger.warning("%s was published for years %r but this process uses %r: %s. Republish with --years "
+                       "or set GDP_YEARS to match.", path, published_window.decode(), years,
+                       "any years outside the published window are missing" if shared
+                       else "it filters a private copy, so its data is not shared")
+    if shared:
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas(split_blocks=True)
+    return _filter_gdp(table.select(_read_columns(columns) or table.column_names).to_pandas(split_blocks=True),
+                       columns, years, cities)
+
+
+# Function to read the GDP data from a CSV file, a Parquet dataset directory (the files
+# in listing, default: all) or a shared Arrow file
+def _read_gdp(path, columns=None, years=None, cities=None, listing=None):
+    if os.path.isdir(path):
+        return _read_gdp_parquet(path, columns, years, cities, listing)
+    if path.endswith(".arrow"):
+        return _read_gdp_arrow(path, columns, years, cities)
+    return _read_gdp_csv(path, columns, years, cities)
+
+
+# Function to pick the source dataset: the Parquet copy if it exists, else the CSV
+def default_source_path():
+    return GDP_PARQUET_DIR if os.path.isdir(GDP_PARQUET_DIR) else GDP_FILE
+
+
+# Function to pick the dataset to load: the shared copy if one was published, else the source
+def default_gdp_path():
+    return GDP_SHARED_FILE if os.path.exists(GDP_SHARED_FILE) else default_source_path()
+
+
+# Function to read the rows appended to the GDP CSV since it was cached: returns
+# (version, new rows), or None unless the old contents are an unchanged prefix
+def _read_csv_appended(path, old_stamp, stamp, old_version, columns):
+    if len(old_stamp) != 1 or old_stamp[0][0] != "":
+        return None
+    old_size = old_stamp[0][2]
+    with open(path, "rb") as data_file:
+        content = data_file.read()
+    if (len(content) <= old_size or content[old_size - 1:old_size] != b"\n"
+            or _hash_bytes(content[:old_size]) != old_version):
+        return None
+    header = content[:content.index(b"\n") + 1]
+    return _hash_bytes(content), _parse_gdp_csv(io.BytesIO(header + content[old_size:]), columns)
+
+
+# Function to read the partition files added to a Parquet dataset between the listings
+# old_stamp and stamp: returns (version, new rows), or None if any cached file changed or went away
+def _read_parquet_appended(path, old_stamp, stamp, old_version, columns):
+    old_files = set(old_stamp)
+    if not old_files <= set(stamp) or len(stamp) == len(old_stamp):
+        return None
+    added = [item for item in stamp if item not in old_files]
+    if not _data_files(path, added):
+        return None
+    return _file_hash(path, stamp), _read_gdp_parquet(path, _read_columns(columns), listing=added)
+
+
+# Function to merge GDP rows into a cached frame, keeping City categorical
+def _concat_gdp(gdp_data, new_rows):
+    if "City" in gdp_data.columns:
+        categories = gdp_data["City"].cat.categories.union(new_rows["City"].cat.categories, sort=False)
+        gdp_data = gdp_data.assign(City=gdp_data["City"].cat.set_categories(categories))
+        new_rows = new_rows.assign(City=new_rows["City"].cat.set_categories(categories))
+    return pd.concat([gdp_data, new_rows], ignore_index=True)
+
+
+# Function to bring a cached GDP frame up to date by reading only what was appended
+# between the stamps old_stamp and stamp: returns (version, merged frame, row where the
+# old frame ended), or None when the change is not a pure append (then the whole
+# dataset is re-read)
+def _append_gdp(path, old_stamp, stamp, old_version, gdp_data, columns=None, years=None, cities=None):
+    if path.endswith(".arrow") or (isinstance(years, LatestYears) and "Year" not in gdp_data.columns):
+        # A shared file is republished as a whole
+        return None
+    read_appended = _read_parquet_appended if os.path.isdir(path) else _read_csv_appended
+    appended = read_appended(path, old_stamp, stamp, old_version, columns)
+    if appended is None:
+        return None
+    version, new_rows = appended
+    if isinstance(years, LatestYears):
+        old_years = pd.unique(gdp_data["Year"])
+        window = _window_years(years, list(old_years) + list(pd.unique(new_rows["Year"])))
+        if not set(int(year) for year in old_years) <= set(window):
+            # A newer year pushed an old one out of the window: rows go away, not just come in
+            return None
+        years = window
+    return version, _concat_gdp(gdp_data, _filter_gdp(new_rows, columns, years, cities)), len(gdp_data)
+
+
+# Function to load a file through a reader, re-reading it only when the file changes.
+# With an appender, appended data is merged into the cached frame instead of re-reading it all.
+# A refresh lists a dataset directory once and reads exactly the files in that listing
+# (readers get it as listing=), which is then the stamp of the entry: files added while
+# it reads are new at the next refresh, not read twice.
+def _load_entry(path, reader=None, args=(), appender=None):
+    reader = reader or _read_gdp
+    if path is None:
+        path = default_gdp_path()
+    if not os.path.exists(path):
+        return None
+    key = (os.path.abspath(path), reader, args)
+    started = time.monotonic()
+    stamp = _file_stamp(path)
+    entry = _cache.get(key)
+    # A reused directory listing is the very stamp cached with the entry, so "is" skips
+    # comparing thousands of file entries
+    if entry is not None and (entry[0] is stamp or entry[0] == stamp):
+        return entry
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and (entry[0] is stamp or entry[0] == stamp):
+            return entry
+        # A reused listing may be stale: list again unless it was listed during this call
+        stamp = _file_stamp(path, max_age=time.monotonic() - started)
+        if entry is not None and entry[0] == stamp:
+            return entry
+        appended = None
+        if entry is not None and appender is not None:
+            appended = appender(path, entry[0], stamp, entry[1], entry[2], *args)
+        if appended is not None:
+            version, frame, old_rows = appended
+            # The new frame still extends every earlier version the old one did
+            earlier = list({**entry[3], entry[1]: old_rows}.items())[-MAX_APPENDED_VERSIONS:]
+            entry = (stamp, version, frame, dict(earlier))
+        else:
+            is_dir = os.path.isdir(path)
+            version = _file_hash(path, stamp if is_dir else None)
+            if entry is not None and entry[1] == version:
+                # Touched but unchanged: keep the frame we already have
+                entry = (stamp, version, entry[2], entry[3])
+            else:
+                entry = (stamp, version, reader(path, *args, listing=stamp) if is_dir else reader(path, *args), {})
+        _cache[key] = entry
+        return entry
+
+
+# Function to load any data file through the shared cache: returns (data, version),
+# or (None, None) if the file is missing
+def load_cached_file(path, reader):
+    entry = _load_entry(path, reader)
+    return (None, None) if entry is None else (entry[2], entry[1])
+
+
+# Function to turn query arguments into a hashable cache key
+def _query(columns, years, cities):
+    if isinstance(years, str):
+        years = parse_year_window(years)
+    return (None if columns is None else tuple(columns),
+            years if years is None or isinstance(years, LatestYears) else tuple(int(year) for year in years),
+            None if cities is None else tuple(sorted(cities)))
+
+
+# Function to get the shared GDP frame together with its version, from one cache lookup.
+# Only the given columns, years (default: the dashboard window; a window string or
+# None for all) and cities are loaded. Returns (None, None) if the dataset is missing.
+def load_gdp_dataset(path=None, columns=None, years=YEARS, cities=None):
+    entry = _load_entry(path, _read_gdp, _query(columns, years, cities), _append_gdp)
+    return (None, None) if entry is None else (entry[2], entry[1])
+
+
+# Function to get the GDP frame and what changed since an earlier version: returns
+# (frame, version, first new row). first new row is set when the frame is the
+# since_version frame with rows appended after it, and None otherwise.
+def load_gdp_changes(since_version, path=None, columns=None, years=YEARS, cities=None):
+    entry = _load_entry(path, _read_gdp, _query(columns, years, cities), _append_gdp)
+    return (None, None, None) if entry is None else (entry[2], entry[1], entry[3].get(since_version))
+
+
+# Function to get the shared GDP frame (None if the dataset is missing).
+# The frame is shared across sessions, so callers must not modify it.
+def load_gdp_data(path=None, columns=None, years=YEARS, cities=None):
+    return load_gdp_dataset(path, columns, years, cities)[0]
+
+
+# Function to get the version of the current dataset
+def get_dataset_version(path=None):
+    return load_gdp_dataset(path)[1]
+
+
+# Process-wide cache of one kind of value derived from the GDP dataset (aggregates, KPIs,
+# rankings), kept per dataset and year window at the dataset's current version.
+# build(gdp_data, version) makes a value from scratch from the given columns (default:
+# all); when the dataset only had rows appended since the cached value,
+# value.with_appended_rows(gdp_data, version, first new row) merges them in instead.
+# Values must expose their dataset version as .version.
+class DerivedCache:
+    def __init__(self, build, columns=None):
+        self._build = build
+        self.columns = columns
+        self._values = {}  # (path, year window) -> latest value
+        self._lock = threading.Lock()
+
+    # Function to get the value for the dataset's current version (None if the dataset
+    # is missing or has no rows in the year window)
+    def get(self, path=None, years=YEARS):
+        key = (os.path.abspath(path or default_gdp_path()), _query(None, years, None)[1])
+        value = self._values.get(key)
+        gdp_data, version, _ = load_gdp_changes(None, path, self.columns, years)
+        if gdp_data is None or gdp_data.empty:
+            return None
+        if value is not None and value.version == version:
+            return value
+
+        with self._lock:
+            value = self._values.get(key)
+            if value is None or value.version != version:
+                gdp_data, version, first_new_row = load_gdp_changes(None if value is None else value.version,
+                                                                    path, self.columns, years)
+                if gdp_data is None or gdp_data.empty:
+                    return None
+                if first_new_row is not None:
+                    value = value.with_appended_rows(gdp_data, version, first_new_row)
+                else:
+                    value = self._build(gdp_data, version)
+                self._values[key] = value
+            return value
+
+    # Function to drop every cached value (used by tests and benchmarks)
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+# Function to drop every cached file (used by benchmarks)
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+        _listings.clear()
+
+
+# Function to write GDP rows as a hive-partitioned Parquet dataset. pyarrow refuses to
+# write more than 1024 partitions by default, so the limit is sized to the data. Rows are
+# sorted by partition, so a file is complete whenever pyarrow closes it to stay under its
+# open-files limit.
+def _write_partitioned(gdp_data, out_dir, partitions, **options):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    partition_count = max(1, len(gdp_data[partitions].drop_duplicates()))
+    gdp_data = gdp_data.sort_values(partitions, kind="stable")
+    ds.write_dataset(pa.Table.from_pandas(gdp_data, preserve_index=False), out_dir, format="parquet",
+                     partitioning=partitions, partitioning_flavor="hive", max_partitions=partition_count,
+                     max_open_files=min(partition_count, MAX_OPEN_FILES), **options)
+
+
+# Function to write the GDP CSV (every year) as a Parquet dataset partitioned by
+# Year, and optionally by City. The new copy replaces out_dir in one rename.
+def convert_csv_to_parquet(csv_path=GDP_FILE, out_dir=GDP_PARQUET_DIR, by_city=False):
+    gdp_data = _read_gdp_csv(csv_path)
+    partitions = ["Year", "City"] if by_city else ["Year"]
+    staging_dir = out_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    _write_partitioned(gdp_data, staging_dir, partitions)
+    if os.path.exists(out_dir):
+        old_dir = out_dir.rstrip(os.sep) + ".old"
+        shutil.rmtree(old_dir, ignore_errors=True)
+        os.replace(out_dir, old_dir)
+        os.replace(staging_dir, out_dir)
+        shutil.rmtree(old_dir)
+    else:
+        os.replace(staging_dir, out_dir)
+    # This process sees its own writes without waiting for the listing to expire
+    _listings.pop(os.path.abspath(out_dir), None)
+    return len(gdp_data)
+
+
+# Function to add the rows of a CSV to an existing Parquet dataset as new partition
+# files, which a running app picks up without re-reading the older partitions.
+# Files are written aside and moved in one at a time, so readers never see half a file.
+def append_csv_to_parquet(csv_path, out_dir=GDP_PARQUET_DIR):
+    import pyarrow.dataset as ds
+
+    # Write with the dataset's own partition columns (Year, or Year and City)
+    dataset = ds.dataset(out_dir, format="parquet", partitioning="hive")
+    partitions = list(dataset.partitioning.schema.names) if dataset.partitioning else ["Year"]
+    gdp_data = _read_gdp_csv(csv_path)
+    staging_dir = out_dir.rstrip(os.sep) + ".append"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    _write_partitioned(gdp_data, staging_dir, partitions, basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet")
+    for folder, _, files in os.walk(staging_dir):
+        for name in files:
+            target = os.path.join(out_dir, os.path.relpath(os.path.join(folder, name), staging_dir))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(os.path.join(folder, name), target)
+    shutil.rmtree(staging_dir)
+    _listings.pop(os.path.abspath(out_dir), None)  # see convert_csv_to_parquet
+    return len(gdp_data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the GDP CSV into a Parquet dataset partitioned by year")
+    parser.add_argument("csv_path", nargs="?", default=GDP_FILE)
+    parser.add_argument("out_dir", nargs="?", default=GDP_PARQUET_DIR)
+    parser.add_argument("--by-city", action="store_true", help="also partition each year by city")
+    parser.add_argument("--append", action="store_true",
+                        help="add the CSV's rows to the existing dataset as new partition files")
+    args = parser.parse_args()
+    if args.append:
+        rows = append_csv_to_parquet(args.csv_path, args.out_dir)
+        print(f"Appended {rows} rows to {args.out_dir}")
+    else:
+        rows = convert_csv_to_parquet(args.csv_path, args.out_dir, args.by_city)
+        print(f"Wrote {rows} rows to {args.out_dir}")
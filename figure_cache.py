@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Memory budget for cached figures, measured as the size of their JSON spec
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+
+# Bounded LRU cache of Plotly figures shared by every session.
+# Keys are (page, chart, filters, dataset version): filters holds only the
+# widget values the chart actually depends on, so e.g. the all-city scatter
+# is built once per dataset version no matter which city is selected.
+class FigureCache:
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._figures = OrderedDict()  # key -> (figure, size in bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._building = {}  # key -> lock, so one chart is never built twice at once
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.build_seconds = {}  # (page, chart) -> [builds, total seconds]
+
+    # Function to return the cached figure for this key, building it with build() on a miss
+    def get(self, page, chart, filters, version, build):
+        key = (page, chart, tuple(filters), version)
+        figure = self._lookup(key)
+        if figure is not None:
+            return figure
+
+        with self._lock:
+            build_lock = self._building.setdefault(key, threading.Lock())
+        with build_lock:
+            figure = self._lookup(key, count=False)
+            if figure is not None:
+                return figure
+            start = time.perf_counter()
+            figure = build()
+            elapsed = time.perf_counter() - start
+            self._store(key, figure, elapsed)
+        with self._lock:
+            self._building.pop(key, None)
+        return figure
+
+    # Function to look a key up and count the hit or miss
+    def _lookup(self, key, count=True):
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if count:
+                self.misses += 1
+            return None
+
+    # Function to add a figure and evict the least recently used ones over the budget
+    def _store(self, key, figure, elapsed):
+        size = len(figure.to_json())
+        with self._lock:
+            builds = self.build_seconds.setdefault(key[:2], [0, 0.0])
+            builds[0] += 1
+            builds[1] += elapsed
+            if size > self.max_bytes:
+                return
+            old = self._figures.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._figures[key] = (figure, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._figures.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    # Function to get hit rate, memory use and build times
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "figures": len(self._figures),
+                "bytes": self._bytes,
+                "build_seconds": {f"{page}/{chart}": {"builds": builds, "total": total, "mean": total / builds}
+                                  for (page, chart), (builds, total) in self.build_seconds.items()},
+            }
+
+    # Function to drop every cached figure
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
+            self._bytes = 0
+
+
+# One cache per process
+figure_cache = FigureCache()
+
+
+# Function to get a figure through the shared cache
+def cached_figure(page, chart, filters, version, build):
+    return figure_cache.get(page, chart, filters, version, build)
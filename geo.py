@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import load_cached_file
+
+# Reference table with one row per city: City, Latitude, Longitude
+COORDS_FILE = "city_coords.csv"
+
+
+# Function to parse the coordinates table, indexed by city
+def _read_city_coords(path):
+    coords = pd.read_csv(path, dtype={"City": "string", "Latitude": "float64", "Longitude": "float64"})
+    coords = coords.dropna(subset=["City"]).drop_duplicates(subset="City", keep="last")
+    return coords.set_index("City")[["Latitude", "Longitude"]]
+
+
+# Function to get the shared coordinates table (an empty table if the file is missing)
+def load_city_coords(path=COORDS_FILE):
+    coords, _ = load_cached_file(path, _read_city_coords)
+    if coords is None:
+        coords = pd.DataFrame({"Latitude": [], "Longitude": []}, index=pd.Index([], name="City", dtype="string"))
+    return coords
+
+
+# Function to get the version of the coordinates table (None if the file is missing)
+def get_coords_version(path=COORDS_FILE):
+    _, version = load_cached_file(path, _read_city_coords)
+    return version
+
+
+# Function to look up Latitude and Longitude for every row of a frame with a City
+# column: returns two float arrays, NaN where a city has no coordinates
+def coordinate_columns(frame, coords=None):
+    if coords is None:
+        coords = load_city_coords()
+    cities = frame["City"]
+    if not isinstance(cities.dtype, pd.CategoricalDtype):
+        cities = cities.astype("category")
+
+    # Look up each distinct city once, then spread the result over the rows by category code
+    lookup = coords.reindex(cities.cat.categories.astype(str))
+    codes = cities.cat.codes.to_numpy()
+    known = codes >= 0
+    latitude = np.where(known, lookup["Latitude"].to_numpy()[codes], np.nan)
+    longitude = np.where(known, lookup["Longitude"].to_numpy()[codes], np.nan)
+    return latitude, longitude
+
+
+# Function to attach Latitude/Longitude to a frame with a City column.
+# Returns a new frame holding only the rows with known coordinates, plus
+# the sorted list of cities that have no coordinates. Frames that already
+# carry the columns (the shared dataset, see shared_dataset.py) are used as they are.
+def add_coordinates(frame, coords=None):
+    if coords is None and {"Latitude", "Longitude"} <= set(frame.columns):
+        located = frame
+        latitude, longitude = frame["Latitude"].to_numpy(), frame["Longitude"].to_numpy()
+    else:
+        latitude, longitude = coordinate_columns(frame, coords)
+        located = frame.assign(Latitude=latitude, Longitude=longitude)
+    has_coords = ~(np.isnan(latitude) | np.isnan(longitude))
+    missing = sorted(set(located.loc[~has_coords, "City"].dropna().astype(str)))
+    return located[has_coords], missing
@@ -0,0 +1,134 @@
+import copy
+
+from city_year import TOTALS_COLUMNS, CityYearIndex, city_year_totals, replace_city_rows, touched_cities
+from data_loader import YEARS, DerivedCache
+
+# Dashboard tiles: KPI column -> label. Each KPI also gets a "<kpi>_delta" column:
+# its change from the previous year, in percentage points.
+KPIS = {
+    "gdp_growth": "📈 GDP Growth Rate",
+    "employment_rate": "💼 Employment Rate",
+    "industrial_growth": "🏭 Industrial Growth",
+    "unemployment_rate": "📉 Unemployment Rate",
+}
+# KPIs where a fall is good news (shown with inverted delta colours)
+LOWER_IS_BETTER = {"unemployment_rate"}
+# Name of the whole-country row
+NATIONAL = "All India"
+
+
+# Totals (see city_year.city_year_totals) the KPIs are computed from
+_TOTALS = ["gdp", "industry", "unemployed", "population"]
+_PREVIOUS = [f"previous_{column}" for column in _TOTALS]
+
+
+# Function to set the KPI columns of frame: levels from its own totals, and growth and the
+# unemployment change from compared's totals against its previous_* (previous year) totals
+def _set_kpis(frame, compared):
+    frame["gdp_growth"] = (compared["gdp"] / compared["previous_gdp"] - 1) * 100
+    frame["industrial_growth"] = (compared["industry"] / compared["previous_industry"] - 1) * 100
+    frame["unemployment_rate"] = frame["unemployed"] / frame["population"] * 100
+    frame["employment_rate"] = 100 - frame["unemployment_rate"]
+    unemployment_change = (compared["unemployed"] / compared["population"]
+                           - compared["previous_unemployed"] / compared["previous_population"]) * 100
+    frame["unemployment_rate_delta"] = unemployment_change
+    frame["employment_rate_delta"] = 0.0 - unemployment_change  # no change reads +0.0, not -0.0
+
+
+# Function to compute the KPIs and their year-over-year deltas for every (City, Year) of
+# totals at once: rows are sorted by city and year, and each row is compared with the
+# row before it in the same city (a shifted group), if that row is the previous year
+def _with_kpis(totals):
+    frame = totals.sort_values(["City", "Year"], ignore_index=True)
+    previous = frame.groupby("City", sort=False, observed=True)[["Year"] + _TOTALS].shift(1)
+    consecutive = previous["Year"] == frame["Year"] - 1
+    frame[_PREVIOUS] = previous[_TOTALS].where(consecutive, axis=0).to_numpy()
+    _set_kpis(frame, frame)
+    growth = ["gdp_growth", "industrial_growth"]
+    deltas = frame.groupby("City", sort=False, observed=True)[growth].diff().where(consecutive, axis=0)
+    frame[[f"{kpi}_delta" for kpi in growth]] = deltas.to_numpy()
+    return frame
+
+
+# Function to compute the national KPIs per year from the per-city ones. Levels cover every
+# city reported in a year; growth and changes compare only the cities reported in both that
+# year and the year before, so a partly reported year is not set against a full one.
+def _national_kpis(city_kpis):
+    by_year = city_kpis.groupby("Year")
+    national = by_year[_TOTALS].sum()
+    national["cities"] = by_year.size()
+    compared = city_kpis[city_kpis["previous_gdp"].notna()].groupby("Year")[_TOTALS + _PREVIOUS].sum()
+    _set_kpis(national, compared.reindex(national.index))
+    consecutive = national.index.to_series().diff() == 1
+    for kpi in ("gdp_growth", "industrial_growth"):
+        national[f"{kpi}_delta"] = national[kpi].diff().where(consecutive)
+    return national
+
+
+# KPIs per city and for the whole country, for one version of the GDP dataset.
+# When rows are appended, only the cities they touch are recomputed.
+class KpiTable:
+    def __init__(self, gdp_data, version):
+        self.version = version
+        self._set_city_kpis(_with_kpis(city_year_totals(gdp_data)))
+
+    # Function to get the KPIs of a newer version that only appended rows,
+    # from row first_new_row of gdp_data on. This object is left unchanged.
+    def with_appended_rows(self, gdp_data, version, first_new_row):
+        _, city_rows = touched_cities(gdp_data, first_new_row)
+        kpis = copy.copy(self)
+        kpis.version = version
+        kpis._set_city_kpis(replace_city_rows(self._city_kpis, _with_kpis(city_year_totals(city_rows))))
+        return kpis
+
+    # Function to store the per-city KPIs and derive the national ones from their totals
+    def _set_city_kpis(self, city_kpis):
+        # Sorted by (City code, Year), so a city's rows are found by binary search
+        self._city_kpis = city_kpis
+        self._index = CityYearIndex(city_kpis)
+        # Year -> KPI row for the whole country
+        self._national = _national_kpis(city_kpis)
+        self.years = sorted(int(year) for year in self._national.index)
+        self.cities = sorted(str(city) for city in city_kpis["City"].unique())
+
+    # Function to get the latest year with data for a city (or NATIONAL); None if it has none
+    def latest_year(self, city=NATIONAL):
+        years = self.years if city == NATIONAL else self._index.years(city)
+        return years[-1] if years else None
+
+    # Function to count the cities reported in a year
+    def cities_reported(self, year):
+        return int(self._national["cities"].get(int(year), 0))
+
+    # Function to get the KPIs of a city (or NATIONAL) in a year (default: the latest):
+    # {kpi: (value, delta)}, with NaN where there is no previous year to compare with,
+    # and all NaN if the city has no data that year
+    def get(self, city=NATIONAL, year=None):
+        year = self.years[-1] if year is None else int(year)
+        row = None
+        if city == NATIONAL:
+            if year in self._national.index:
+                row = self._national.loc[year]
+        else:
+            index = self._index.row(city, year)
+            if index is not None:
+                row = self._city_kpis.iloc[index]
+        if row is None:
+            return {kpi: (float("nan"), float("nan")) for kpi in KPIS}
+        return {kpi: (float(row[kpi]), float(row[f"{kpi}_delta"])) for kpi in KPIS}
+
+    # Function to get every city's KPIs for one year, as a frame indexed by city
+    def for_year(self, year):
+        rows = self._city_kpis[self._city_kpis["Year"] == int(year)]
+        return rows.set_index("City")[[column for kpi in KPIS for column in (kpi, f"{kpi}_delta")]]
+
+
+# Latest KPIs per dataset and year window, built from the totals' columns only
+_kpis = DerivedCache(KpiTable, TOTALS_COLUMNS)
+
+
+# Function to get the KPIs for the current dataset version (None if the
+# dataset is missing or has no rows in the year window).
+# If the dataset only grew since the cached version, the new rows are merged in.
+def get_kpis(path=None, years=YEARS):
+    return _kpis.get(path, years)
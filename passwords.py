@@ -0,0 +1,180 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Stored hashes look like "pbkdf2_sha256$<iterations>$<salt>$<hash>" or
+# "scrypt$<n>$<r>$<p>$<salt>$<hash>" (salt and hash base64), so every user
+# carries their own salt and KDF parameters. Bare 64-char hex strings are
+# the old unsalted SHA-256 hashes and are upgraded on the next login.
+DEFAULT_SCHEME = "pbkdf2_sha256"
+PBKDF2_ITERATIONS = 600_000
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+SALT_BYTES = 16
+
+# KDF work runs here, never on the Streamlit script thread directly.
+# hashlib releases the GIL while hashing, so the pool size caps login CPU.
+HASH_WORKERS = max(2, min(8, os.cpu_count() or 2))
+_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+
+
+# Function to base64-encode bytes without padding
+def _b64(data):
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+# Function to decode unpadded base64
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+# Function to derive a key with PBKDF2-SHA256
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+# Function to derive a key with scrypt
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=128 * n * r * 2, dklen=32)
+
+
+# Function to hash a password with a fresh salt using the default scheme
+def hash_password(password, scheme=DEFAULT_SCHEME):
+    salt = secrets.token_bytes(SALT_BYTES)
+    if scheme == "pbkdf2_sha256":
+        return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(salt)}${_b64(_pbkdf2(password, salt, PBKDF2_ITERATIONS))}"
+    if scheme == "scrypt":
+        derived = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(derived)}"
+    raise ValueError(f"Unknown password hashing scheme: {scheme}")
+
+
+# Function to check a password against a stored hash, in constant time.
+# A malformed stored hash (bad base64 or KDF parameters) never matches.
+def verify_password(password, stored):
+    parts = stored.split("$")
+    try:
+        if parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            expected = _unb64(parts[3])
+            actual = _pbkdf2(password, _unb64(parts[2]), int(parts[1]))
+        elif parts[0] == "scrypt" and len(parts) == 6:
+            expected = _unb64(parts[5])
+            actual = _scrypt(password, _unb64(parts[4]), int(parts[1]), int(parts[2]), int(parts[3]))
+        elif len(stored) == 64:
+            # Legacy unsalted SHA-256
+            expected = stored.encode()
+            actual = hashlib.sha256(password.encode()).hexdigest().encode()
+        else:
+            return False
+    except (ValueError, OverflowError):  # binascii.Error is a ValueError
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+# Function to tell whether a stored hash should be replaced (legacy or outdated parameters)
+def needs_rehash(stored):
+    parts = stored.split("$")
+    if parts[0] != DEFAULT_SCHEME:
+        return True
+    if parts[0] == "pbkdf2_sha256":
+        return int(parts[1]) < PBKDF2_ITERATIONS
+    return False
+
+
+# Hash checked for unknown usernames, so a miss costs as much as a wrong password.
+# Verifying costs one full KDF run whatever the digest is, so a random one (that no
+# password matches) is used instead of hashing a password at import time.
+_DUMMY_HASH = (f"pbkdf2_sha256${PBKDF2_ITERATIONS}${_b64(secrets.token_bytes(SALT_BYTES))}"
+               f"${_b64(secrets.token_bytes(32))}")
+
+# Memo of recent successful checks, keyed by an HMAC of (stored hash, password)
+# under a per-process secret, so no password is kept in memory
+_MEMO_SIZE = 1024
+_memo_key = secrets.token_bytes(32)
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+# Function to build the memo key for one check
+def _memo_token(password, stored):
+    return hmac.new(_memo_key, stored.encode() + b"\0" + password.encode(), hashlib.sha256).digest()
+
+
+# Function to verify on the worker pool, reusing recent successful results.
+# Returns (ok, new_hash); new_hash is set when the stored hash should be upgraded.
+def check_password(password, stored):
+    if stored is None:
+        _pool.submit(verify_password, password, _DUMMY_HASH).result()
+        return False, None
+
+    token = _memo_token(password, stored)
+    with _memo_lock:
+        if token in _memo:
+            _memo.move_to_end(token)
+            ok = True
+        else:
+            ok = None
+    if ok is None:
+        ok = _pool.submit(verify_password, password, stored).result()
+        if ok:
+            with _memo_lock:
+                _memo[token] = True
+                while len(_memo) > _MEMO_SIZE:
+                    _memo.popitem(last=False)
+
+    if ok and needs_rehash(stored):
+        return True, _pool.submit(hash_password, password).result()
+    return ok, None
+
+
+# Function to hash a new password on the worker pool
+def hash_password_in_pool(password):
+    return _pool.submit(hash_password, password).result()
+
+
+# In-memory limiter for repeated login failures, per username.
+# After max_failures failures the username is locked for lockout seconds,
+# doubling with each further failure up to max_lockout.
+class FailureLimiter:
+    def __init__(self, max_failures=5, lockout=30.0, max_lockout=900.0, max_entries=10_000):
+        self.max_failures = max_failures
+        self.lockout = lockout
+        self.max_lockout = max_lockout
+        self.max_entries = max_entries
+        self._failures = OrderedDict()  # key -> (failure count, locked until)
+        self._lock = threading.Lock()
+
+    # Function to get the seconds left before this key may try again (0 if not locked)
+    def retry_after(self, key):
+        with self._lock:
+            entry = self._failures.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry[1] - time.monotonic())
+
+    # Function to count one failure for this key
+    def record_failure(self, key):
+        with self._lock:
+            count, _ = self._failures.pop(key, (0, 0.0))
+            count += 1
+            locked_until = 0.0
+            if count >= self.max_failures:
+                delay = min(self.max_lockout, self.lockout * 2 ** (count - self.max_failures))
+                locked_until = time.monotonic() + delay
+            self._failures[key] = (count, locked_until)
+            while len(self._failures) > self.max_entries:
+                self._failures.popitem(last=False)
+
+    # Function to forget the failures of this key (after a successful login)
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+# Shared by every session in this process
+login_limiter = FailureLimiter()
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Most points a scatter chart sends to the browser
+MAX_POINTS = 5_000
+# Cities that keep their own legend entry; the rest are grouped as "Other"
+TOP_K_CITIES = 10
+OTHER_LABEL = "Other"
+
+
+# Function to relabel every city outside the top_k (by total weight) as "Other".
+# Returns None when there are no more than top_k cities. Works on category
+# codes, so the cost does not depend on string lengths.
+def group_top_cities(cities, weights, top_k=TOP_K_CITIES):
+    codes, uniques = pd.factorize(cities)
+    if len(uniques) <= top_k:
+        return None
+    totals = np.bincount(codes[codes >= 0], weights=np.asarray(weights, dtype="float64")[codes >= 0],
+                         minlength=len(uniques))
+    top = np.argsort(-totals, kind="stable")[:top_k]
+    lookup = np.full(len(uniques), top_k)
+    lookup[top] = np.arange(top_k)
+    labels = [str(city) for city in np.asarray(uniques)[top]] + [OTHER_LABEL]
+    group_codes = np.where(codes >= 0, lookup[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(group_codes, categories=labels), index=cities.index, name=cities.name)
+
+
+# Function to pick at most max_points rows, sampled per stratum in proportion to its size.
+# Fractional quotas are rounded at random and every stratum keeps at least one row,
+# unless that would break the budget.
+def stratified_sample(frame, strata, max_points=MAX_POINTS, seed=0):
+    if len(frame) <= max_points:
+        return frame
+    rng = np.random.default_rng(seed)
+    codes, uniques = pd.factorize(strata)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    share = counts * (max_points / len(frame))
+    quota = np.maximum(1, np.floor(share + rng.random(len(uniques))).astype(int))
+
+    order = rng.permutation(len(frame))
+    shuffled_codes = codes[order]
+    # Position of each shuffled row within its stratum
+    rank = pd.Series(shuffled_codes).groupby(shuffled_codes).cumcount().to_numpy()
+    keep = (shuffled_codes >= 0) & (rank < quota[np.maximum(shuffled_codes, 0)])
+    # Rows are in random order, so trimming the overflow drops random rows
+    return frame.iloc[np.sort(order[keep][:max_points])]
+
+
+# Function to fit a frame into the point budget for a chart coloured by city.
+# Returns (plot frame, note); note is None when nothing was changed.
+# In the plot frame "City" holds the legend group and "City name" the real city.
+def fit_point_budget(frame, columns, weight_column, max_points=MAX_POINTS, top_k=TOP_K_CITIES):
+    plot_frame = frame[["City"] + [column for column in columns if column != "City"]]
+    grouped = group_top_cities(plot_frame["City"], plot_frame[weight_column], top_k)
+    sampled = stratified_sample(plot_frame, plot_frame["City"], max_points)
+    was_sampled = len(sampled) < len(plot_frame)
+    if grouped is None and not was_sampled:
+        return plot_frame, None
+
+    notes = []
+    if was_sampled:
+        notes.append(f"{len(sampled):,} of {len(plot_frame):,} points, sampled per city")
+    if grouped is not None:
+        notes.append(f"top {top_k} cities by {weight_column}, rest as {OTHER_LABEL}")
+        sampled = sampled.assign(**{"City name": sampled["City"].astype(str), "City": grouped.loc[sampled.index]})
+    else:
+        sampled = sampled.assign(**{"City name": sampled["City"].astype(str)})
+    return sampled, "; ".join(notes)
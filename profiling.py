@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from audit_log import AuditLog
+
+# Render-time profiling is off unless GDP_PROFILING is set (e.g. GDP_PROFILING=1).
+# When off, timed() hands back one shared no-op context and nothing is recorded.
+PROFILING_ENABLED = os.environ.get("GDP_PROFILING", "").lower() not in ("", "0", "false", "no")
+# Usernames allowed to see the profiling panel, comma separated
+ADMIN_USERS = {username.strip() for username in os.environ.get("GDP_ADMIN_USERS", "").split(",") if username.strip()}
+# Structured log for monitoring: one JSON sample per line
+PROFILE_LOG_FILE = "render_profile.jsonl"
+# Samples kept in memory for the panel
+MAX_SAMPLES = 5000
+
+_samples = deque(maxlen=MAX_SAMPLES)
+_log = None
+_log_lock = threading.Lock()
+_NO_TIMING = nullcontext()
+
+
+# Function to get the buffered profile log writer
+def _get_log():
+    global _log
+    if _log is None:
+        with _log_lock:
+            if _log is None:
+                _log = AuditLog(PROFILE_LOG_FILE)
+    return _log
+
+
+# Function to store one measurement: page, kind (data/aggregate/figure/emit/page), name, duration, payload size
+def record(page, kind, name, seconds, size=None):
+    sample = {"page": page, "kind": kind, "name": name, "ms": round(seconds * 1000, 3)}
+    if size is not None:
+        sample["bytes"] = size
+    _samples.append(sample)
+    _get_log().log(sample)
+
+
+@contextmanager
+def _timed(page, kind, name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, kind, name, time.perf_counter() - start)
+
+
+# Function to time a block: with timed("Insights & Analysis", "figure", "treemap"): ...
+def timed(page, kind, name):
+    if not PROFILING_ENABLED:
+        return _NO_TIMING
+    return _timed(page, kind, name)
+
+
+# Function to start a timer that spans code which can't be wrapped in a with block
+def start_timer():
+    return time.perf_counter() if PROFILING_ENABLED else None
+
+
+# Function to stop a timer from start_timer and record it. size may be a function, called
+# after the clock is read so that measuring the payload is not part of the duration.
+def stop_timer(started, page, kind, name, size=None):
+    if started is not None:
+        seconds = time.perf_counter() - started
+        record(page, kind, name, seconds, size() if callable(size) else size)
+
+
+# Function to get the value at a percentile from sorted values (nearest rank)
+def _percentile(sorted_values, percent):
+    index = max(0, min(len(sorted_values) - 1, int(round(percent / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+# Function to summarize recent samples per (page, kind, name), slowest p95 first
+def summary():
+    groups = {}
+    for sample in list(_samples):
+        groups.setdefault((sample["page"], sample["kind"], sample["name"]), []).append(sample)
+    rows = []
+    for (page, kind, name), samples in groups.items():
+        durations = sorted(sample["ms"] for sample in samples)
+        sizes = [sample["bytes"] for sample in samples if "bytes" in sample]
+        rows.append({
+            "page": page, "kind": kind, "name": name, "count": len(durations),
+            "p50 ms": _percentile(durations, 50), "p95 ms": _percentile(durations, 95), "max ms": durations[-1],
+            "mean bytes": round(sum(sizes) / len(sizes)) if sizes else None,
+        })
+    return sorted(rows, key=lambda row: row["p95 ms"], reverse=True)
+
+
+# Function to export recent samples as JSON lines
+def export_samples():
+    return "".join(json.dumps(sample) + "\n" for sample in list(_samples))
+
+
+# Function to check if a user may see the profiling panel
+def is_admin(username):
+    return username in ADMIN_USERS
@@ -0,0 +1,154 @@
+import copy
+
+import numpy as np
+import pandas as pd
+
+from city_year import TOTALS_COLUMNS, CityYearIndex, city_year_totals, replace_city_rows, touched_cities
+from data_loader import YEARS, DerivedCache
+
+# Ranking metrics: column -> label
+RANKING_METRICS = {
+    "composite_score": "🏆 Investment score",
+    "gdp_cagr": "📈 GDP CAGR (%)",
+    "rolling_growth": "🚀 GDP growth, rolling mean (%)",
+    "gdp": "💰 GDP (billion $)",
+    "rd_intensity": "🔬 R&D expenditure (% of GDP)",
+    "patents": "💡 Patents per 100,000 inhabitants",
+    "unemployment_rate": "📉 Unemployment rate (%)",
+}
+# Metrics where the lowest value ranks first
+LOWER_IS_BETTER = {"unemployment_rate"}
+# Years averaged by the rolling growth rate
+ROLLING_YEARS = 3
+# Composite score: weight of each metric's per-year z-score (signs follow LOWER_IS_BETTER)
+COMPOSITE_WEIGHTS = {"gdp_cagr": 0.3, "rolling_growth": 0.2, "rd_intensity": 0.2, "patents": 0.15, "unemployment_rate": 0.15}
+TOP_K = 10
+
+
+# Function to compute every ranking metric for every (City, Year) of totals (see
+# city_year.city_year_totals) at once.
+# Rows are sorted by city and year; growth compares each row with the row before it in
+# the same city (if that is the previous year), and CAGR runs from the city's first year.
+def _with_metrics(totals):
+    frame = totals.sort_values(["City", "Year"], ignore_index=True)
+    by_city = frame.groupby("City", sort=False, observed=True)
+    frame["rd_intensity"] = frame["rd_spend"] / frame["gdp"] * 100
+    frame["patents"] = frame["patent_count"] / frame["population"] * 100_000
+    frame["unemployment_rate"] = frame["unemployed"] / frame["population"] * 100
+
+    first_year = by_city["Year"].transform("first")
+    span = frame["Year"] - first_year
+    cagr = ((frame["gdp"] / by_city["gdp"].transform("first")) ** (1 / span) - 1) * 100
+    frame["gdp_cagr"] = cagr.where(span > 0)
+
+    previous = by_city[["Year", "gdp"]].shift(1)
+    growth = ((frame["gdp"] / previous["gdp"] - 1) * 100).where(previous["Year"] == frame["Year"] - 1)
+    rolling = growth.groupby(frame["City"], sort=False, observed=True).rolling(ROLLING_YEARS, min_periods=1).mean()
+    frame["rolling_growth"] = rolling.droplevel(0)
+
+    # Composite: weighted mean of the per-year z-scores, over the metrics a row has
+    by_year = frame.groupby("Year")
+    weighted, weights = 0.0, 0.0
+    for metric, weight in COMPOSITE_WEIGHTS.items():
+        std = by_year[metric].transform("std", ddof=0)
+        z_score = ((frame[metric] - by_year[metric].transform("mean")) / std.where(std > 0)).fillna(0)
+        z_score = z_score.where(frame[metric].notna())
+        if metric in LOWER_IS_BETTER:
+            z_score = -z_score
+        weighted = weighted + (weight * z_score).fillna(0)
+        weights = weights + z_score.notna() * weight
+    frame["composite_score"] = weighted / weights.where(weights > 0)
+    return frame
+
+
+# City rankings for one version of the GDP dataset.
+# Each metric has a rank index: the rows sorted by (Year, best value first), so a year's
+# ranking is one contiguous run found by binary search. Top-K is a slice of that run and a
+# city's rank is a binary search for its value in it. When rows are appended, only the
+# totals of the cities they touch are recomputed.
+class CityRankings:
+    def __init__(self, gdp_data, version):
+        self.version = version
+        self._set_totals(city_year_totals(gdp_data))
+
+    # Function to get the rankings of a newer version that only appended rows,
+    # from row first_new_row of gdp_data on. This object is left unchanged.
+    def with_appended_rows(self, gdp_data, version, first_new_row):
+        _, city_rows = touched_cities(gdp_data, first_new_row)
+        rankings = copy.copy(self)
+        rankings.version = version
+        rankings._set_totals(replace_city_rows(self._totals, city_year_totals(city_rows)))
+        return rankings
+
+    # Function to derive the metrics from the per-city totals and build the rank indexes
+    def _set_totals(self, totals):
+        table = _with_metrics(totals)
+        self._totals = table[totals.columns]
+        # Sorted by (City code, Year), so a city's rows are found by binary search
+        self._table = table[["City", "Year"] + list(RANKING_METRICS)]
+        self._index = CityYearIndex(table)
+        self._city_codes = table["City"].cat.codes.to_numpy()
+        years = table["Year"].to_numpy()
+        self._sorted_years = np.sort(years, kind="stable")
+        # metric -> (sort keys, ascending within each year, NaN last; table rows in that order)
+        self._rank_index = {}
+        for metric in RANKING_METRICS:
+            keys = table[metric].to_numpy(dtype="float64")
+            if metric not in LOWER_IS_BETTER:
+                keys = -keys
+            order = np.lexsort((keys, years))
+            self._rank_index[metric] = (keys[order], order)
+        self.years = sorted(int(year) for year in pd.unique(years))
+        self.cities = sorted(str(city) for city in table["City"].unique())
+
+    # Function to find a year's run in the rank indexes: (first, stop) rows
+    def _year_span(self, year):
+        return np.searchsorted(self._sorted_years, [year, year + 1])
+
+    # Function to get the k best cities by a metric in a year (default: the latest), as a
+    # frame with Rank, City and the metric. Tied values share a rank; cities with no value
+    # for the metric (e.g. growth in their first year) are left out.
+    def top(self, metric, year=None, k=TOP_K):
+        year = self.years[-1] if year is None else int(year)
+        sorted_keys, order = self._rank_index[metric]
+        first, stop = self._year_span(year)
+        ranked = first + np.searchsorted(sorted_keys[first:stop], np.nan)
+        rows = order[first:min(first + k, ranked)]
+        ranks = np.searchsorted(sorted_keys[first:stop], sorted_keys[first:first + len(rows)]) + 1
+        cities = self._table["City"].cat.categories.to_numpy()[self._city_codes[rows]]
+        return pd.DataFrame({"Rank": ranks, "City": cities, metric: self._table[metric].to_numpy()[rows]})
+
+    # Function to get a city's rank by a metric in a year (default: the latest):
+    # (rank, number of ranked cities), with rank None if the city has no value for it
+    def rank_of(self, city, metric, year=None):
+        year = self.years[-1] if year is None else int(year)
+        sorted_keys, _ = self._rank_index[metric]
+        first, stop = self._year_span(year)
+        ranked = int(np.searchsorted(sorted_keys[first:stop], np.nan))
+        index = self._index.row(city, year)
+        value = np.nan if index is None else self._table[metric].iat[index]
+        if np.isnan(value):
+            return None, ranked
+        key = value if metric in LOWER_IS_BETTER else -value
+        return int(np.searchsorted(sorted_keys[first:stop], key)) + 1, ranked
+
+    # Function to get all of a city's metrics in a year (default: the latest):
+    # {metric: value}, all NaN if the city has no data that year
+    def scores(self, city, year=None):
+        year = self.years[-1] if year is None else int(year)
+        index = self._index.row(city, year)
+        if index is None:
+            return {metric: float("nan") for metric in RANKING_METRICS}
+        row = self._table.iloc[index]
+        return {metric: float(row[metric]) for metric in RANKING_METRICS}
+
+
+# Latest rankings per dataset and year window, built from the totals' columns only
+_rankings = DerivedCache(CityRankings, TOTALS_COLUMNS)
+
+
+# Function to get the rankings for the current dataset version (None if the
+# dataset is missing or has no rows in the year window).
+# If the dataset only grew since the cached version, the new rows are merged in.
+def get_rankings(path=None, years=YEARS):
+    return _rankings.get(path, years)
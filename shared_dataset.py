@@ -0,0 +1,56 @@
+import argparse
+import os
+
+from data_loader import GDP_SHARED_FILE, YEAR_WINDOW, default_source_path, load_gdp_dataset, parse_year_window
+from geo import COORDS_FILE, coordinate_columns, load_city_coords
+
+# Several Streamlit server processes on one host can share a single copy of the dataset:
+# publish it once to an uncompressed Arrow IPC file, and every worker memory-maps that
+# file read-only (see data_loader._read_gdp_arrow) instead of parsing its own copy.
+#
+#   python shared_dataset.py                     # publish gdp_shared.arrow next to the app
+#   python shared_dataset.py --years latest:5    # publish another year window
+#
+# Workers pick up a republished file on their next load. The file is replaced with one
+# rename, so processes still mapping the old file keep reading it until they reload.
+
+
+# Function to write the GDP data, with its Latitude/Longitude columns precomputed, as an
+# Arrow file that workers map read-only. Rows are sorted by year and city, so each
+# year's and each city-year's rows are contiguous and can be sliced without copying.
+# Returns the number of rows written.
+def publish_shared_dataset(source_path=None, out_path=GDP_SHARED_FILE, years=YEAR_WINDOW, coords_path=COORDS_FILE):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    gdp_data, version = load_gdp_dataset(source_path or default_source_path(), years=years)
+    if gdp_data is None:
+        raise FileNotFoundError("GDP dataset not found")
+    gdp_data = gdp_data.sort_values(["Year", "City"], kind="stable", ignore_index=True)
+    latitude, longitude = coordinate_columns(gdp_data, load_city_coords(coords_path))
+    gdp_data = gdp_data.assign(Latitude=latitude, Longitude=longitude)
+
+    table = pa.Table.from_pandas(gdp_data, preserve_index=False)
+    # Workers compare the window with their own GDP_YEARS (see data_loader._read_gdp_arrow)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"gdp_source_version": version.encode(),
+                                           b"gdp_year_window": years.encode()})
+    temp_path = f"{out_path}.tmp"
+    with pa.OSFile(temp_path, "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temp_path, out_path)
+    return len(gdp_data)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish the GDP dataset as a memory-mapped file shared by all workers")
+    parser.add_argument("--source", help="CSV file or Parquet dataset folder (default: the app's source dataset)")
+    parser.add_argument("--out", default=GDP_SHARED_FILE)
+    parser.add_argument("--years", default=YEAR_WINDOW, help="year window, e.g. 2019-2023, latest:5 or all")
+    parser.add_argument("--coords", default=COORDS_FILE, help="city coordinates table")
+    args = parser.parse_args()
+    try:
+        parse_year_window(args.years)
+        rows = publish_shared_dataset(args.source, args.out, args.years, args.coords)
+    except (FileNotFoundError, ValueError) as error:
+        parser.exit(1, f"{error}\n")
+    print(f"Published {rows} rows to {args.out}")
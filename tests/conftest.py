@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import aggregates
+import data_loader
+import kpis
+import rankings
+
+
+# Every test starts from empty process-wide caches
+@pytest.fixture(autouse=True)
+def clear_caches():
+    data_loader.clear_cache()
+    aggregates._aggregates.clear()
+    kpis._kpis.clear()
+    rankings._rankings.clear()
+    yield
+
+
+# A copy of the shipped dataset in a temporary folder: returns its path
+@pytest.fixture
+def gdp_csv(tmp_path):
+    with open(os.path.join(ROOT, data_loader.GDP_FILE), "rb") as source:
+        content = source.read().replace(b"\r\n", b"\n")
+    path = tmp_path / data_loader.GDP_FILE
+    path.write_bytes(content)
+    return str(path)
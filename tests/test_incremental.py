@@ -0,0 +1,197 @@
+import os
+
+import pandas as pd
+import pytest
+
+import aggregates
+import charts
+import data_loader
+import kpis
+import rankings
+from aggregates import GdpAggregates
+from kpis import KpiTable
+from rankings import CityRankings
+
+
+# Function to load every year of the dataset and what was appended since an earlier version
+def load(path, since_version=None):
+    return data_loader.load_gdp_changes(since_version, path, years=None)
+
+
+# Function to make a frame comparable whatever its City categories and row order
+def normalized(frame, keys=("City", "Year")):
+    frame = frame.assign(City=frame["City"].astype(str)) if "City" in frame.columns else frame.reset_index()
+    return frame.sort_values(list(keys), kind="stable", ignore_index=True)
+
+
+# Function to split the CSV at path: keep the rows `appended` does not select, and
+# return the rest (as bytes) for the test to append later
+def hold_back(path, appended):
+    with open(path, "rb") as csv_file:
+        header, *lines = csv_file.read().splitlines(keepends=True)
+    kept = [line for line in lines if not appended(line)]
+    with open(path, "wb") as csv_file:
+        csv_file.write(header + b"".join(kept))
+    return b"".join(line for line in lines if appended(line))
+
+
+# Function to append raw CSV rows to the file at path
+def append(path, rows):
+    with open(path, "ab") as csv_file:
+        csv_file.write(rows)
+
+
+# Function to copy one city's row of a year as a row of another year (a partly reported year)
+def copy_row(path, city, year, new_year):
+    with open(path, "rb") as csv_file:
+        line = next(line for line in csv_file if line.startswith(f"{city},{year},".encode()))
+    return line.replace(f",{year},".encode(), f",{new_year},".encode(), 1)
+
+
+def assert_same_aggregates(incremental, fresh):
+    assert incremental.years == fresh.years
+    assert incremental.cities == fresh.cities
+    pd.testing.assert_frame_equal(normalized(incremental._cube), normalized(fresh._cube), check_categorical=False)
+    pd.testing.assert_frame_equal(incremental.national_trend, fresh.national_trend)
+    pd.testing.assert_frame_equal(incremental.sector_mean, fresh.sector_mean)
+    pd.testing.assert_frame_equal(normalized(incremental.treemap_data, ("City", "Sector")),
+                                  normalized(fresh.treemap_data, ("City", "Sector")))
+    for year in fresh.years:
+        pd.testing.assert_frame_equal(normalized(incremental.year_rows(year)), normalized(fresh.year_rows(year)),
+                                      check_categorical=False)
+        for metric in aggregates.TOP_METRICS:
+            pd.testing.assert_frame_equal(normalized(incremental.top_cities(year, metric), ()),
+                                          normalized(fresh.top_cities(year, metric), ()), check_categorical=False)
+        for city in fresh.cities:
+            pd.testing.assert_frame_equal(normalized(incremental.city_year_rows(city, year)),
+                                          normalized(fresh.city_year_rows(city, year)), check_categorical=False)
+
+
+def assert_same_kpis(incremental, fresh):
+    assert incremental.years == fresh.years
+    assert incremental.cities == fresh.cities
+    pd.testing.assert_frame_equal(normalized(incremental._city_kpis), normalized(fresh._city_kpis),
+                                  check_categorical=False)
+    pd.testing.assert_frame_equal(incremental._national, fresh._national)
+
+
+def assert_same_rankings(incremental, fresh):
+    assert incremental.years == fresh.years
+    assert incremental.cities == fresh.cities
+    pd.testing.assert_frame_equal(normalized(incremental._table), normalized(fresh._table), check_categorical=False)
+    for year in fresh.years:
+        for metric in rankings.RANKING_METRICS:
+            pd.testing.assert_frame_equal(incremental.top(metric, year, k=50), fresh.top(metric, year, k=50))
+
+
+# Appends: a whole new year, a partly reported year (one city), and a new city
+APPENDS = {
+    "full year": lambda path: hold_back(path, lambda line: b",2023," in line),
+    "partial year": lambda path: copy_row(path, "Pune", 2023, 2024),
+    "new city": lambda path: hold_back(path, lambda line: line.startswith(b"Vadodara,")),
+}
+
+
+@pytest.mark.parametrize("appended", list(APPENDS))
+def test_incremental_merge_matches_full_rebuild(gdp_csv, appended):
+    rows = APPENDS[appended](gdp_csv)
+    old_frame, old_version, _ = load(gdp_csv)
+    old_aggregates = GdpAggregates(old_frame, old_version)
+    old_kpis = KpiTable(old_frame, old_version)
+    old_rankings = CityRankings(old_frame, old_version)
+
+    append(gdp_csv, rows)
+    frame, version, first_new_row = load(gdp_csv, old_version)
+    assert first_new_row == len(old_frame)
+    merged_aggregates = old_aggregates.with_appended_rows(frame, version, first_new_row)
+    merged_kpis = old_kpis.with_appended_rows(frame, version, first_new_row)
+    merged_rankings = old_rankings.with_appended_rows(frame, version, first_new_row)
+
+    data_loader.clear_cache()
+    fresh_frame, fresh_version, _ = load(gdp_csv)
+    assert fresh_version == version
+    pd.testing.assert_frame_equal(normalized(frame), normalized(fresh_frame), check_categorical=False)
+    assert_same_aggregates(merged_aggregates, GdpAggregates(fresh_frame, fresh_version))
+    assert_same_kpis(merged_kpis, KpiTable(fresh_frame, fresh_version))
+    assert_same_rankings(merged_rankings, CityRankings(fresh_frame, fresh_version))
+
+
+def test_parquet_append_matches_full_rebuild(gdp_csv, tmp_path):
+    rows = hold_back(gdp_csv, lambda line: b",2023," in line)
+    parquet_dir = str(tmp_path / "gdp_parquet")
+    data_loader.convert_csv_to_parquet(gdp_csv, parquet_dir)
+    old_frame, old_version, _ = load(parquet_dir)
+    old_aggregates = GdpAggregates(old_frame, old_version)
+
+    new_rows = tmp_path / "new_rows.csv"
+    with open(gdp_csv, "rb") as csv_file:
+        new_rows.write_bytes(csv_file.readline() + rows)
+    data_loader.append_csv_to_parquet(str(new_rows), parquet_dir)
+    frame, version, first_new_row = load(parquet_dir, old_version)
+    assert first_new_row == len(old_frame)
+    merged = old_aggregates.with_appended_rows(frame, version, first_new_row)
+
+    data_loader.clear_cache()
+    fresh_frame, fresh_version, _ = load(parquet_dir)
+    assert_same_aggregates(merged, GdpAggregates(fresh_frame, fresh_version))
+
+
+def test_parquet_append_during_stale_listing_is_read_once(gdp_csv, tmp_path):
+    rows_2023 = hold_back(gdp_csv, lambda line: b",2023," in line)
+    rows_2022 = hold_back(gdp_csv, lambda line: b",2022," in line)
+    parquet_dir = str(tmp_path / "gdp_parquet")
+    data_loader.convert_csv_to_parquet(gdp_csv, parquet_dir)
+    old_frame, old_version, _ = load(parquet_dir)
+
+    with open(gdp_csv, "rb") as csv_file:
+        header = csv_file.readline()
+    for year, rows in ((2022, rows_2022), (2023, rows_2023)):
+        (tmp_path / f"rows_{year}.csv").write_bytes(header + rows)
+    # This process appends 2022 and lists the dataset; another process then appends 2023,
+    # which leaves this process's listing stale until it expires
+    data_loader.append_csv_to_parquet(str(tmp_path / "rows_2022.csv"), parquet_dir)
+    data_loader._file_stamp(parquet_dir)
+    stale = data_loader._listings[os.path.abspath(parquet_dir)]
+    data_loader.append_csv_to_parquet(str(tmp_path / "rows_2023.csv"), parquet_dir)
+    data_loader._listings[os.path.abspath(parquet_dir)] = stale
+
+    frame, version, first_new_row = load(parquet_dir, old_version)
+    assert first_new_row == len(old_frame)
+    # Once the listing expires, nothing is new: the 2023 files were not read twice
+    data_loader._listings.clear()
+    relisted_frame, relisted_version, _ = load(parquet_dir, version)
+    assert relisted_version == version
+    assert relisted_frame is frame
+    assert not frame.duplicated(["City", "Year"]).any()
+
+    data_loader.clear_cache()
+    fresh_frame, fresh_version, _ = load(parquet_dir)
+    assert fresh_version == version
+    pd.testing.assert_frame_equal(normalized(frame), normalized(fresh_frame), check_categorical=False)
+
+
+def test_partial_year_leaves_gaps_that_pages_can_show(gdp_csv):
+    append(gdp_csv, copy_row(gdp_csv, "Pune", 2023, 2024))
+    frame, version, _ = load(gdp_csv)
+    gdp_aggregates = GdpAggregates(frame, version)
+
+    # Delhi has no 2024 rows: no rows, not an error, and its charts still build
+    assert gdp_aggregates.city_year_rows("Delhi", 2024).empty
+    assert list(gdp_aggregates.city_year_rows("Delhi", 2024).columns) == list(frame.columns)
+    assert gdp_aggregates.city_years("Delhi") == [2019, 2020, 2021, 2022, 2023]
+    charts.city_sector_pie(gdp_aggregates, "Delhi", 2024)
+    charts.city_sector_polar(gdp_aggregates, "Delhi", 2024)
+
+    kpi_table = KpiTable(frame, version)
+    assert kpi_table.latest_year("Delhi") == 2023
+    assert all(pd.isna(value) for value, _ in kpi_table.get("Delhi", 2024).values())
+    # Pune's 2024 is a copy of its 2023, so national growth over the cities in both years is 0
+    assert kpi_table.cities_reported(2024) == 1
+    assert kpi_table.get(kpis.NATIONAL, 2024)["gdp_growth"][0] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("window", ["2030-2031", "latest:0"])
+def test_empty_year_window_means_no_data(gdp_csv, window):
+    assert aggregates.get_aggregates(gdp_csv, years=window) is None
+    assert kpis.get_kpis(gdp_csv, years=window) is None
+    assert rankings.get_rankings(gdp_csv, years=window) is None
@@ -0,0 +1,83 @@
+import base64
+import hashlib
+import logging
+import os
+import threading
+
+import streamlit as st
+
+# Background image for the app
+BACKGROUND_IMAGE = "background.avif"
+# With server.enableStaticServing on, files here are served at app/static/<name>
+STATIC_DIR = "static"
+# Types Streamlit's static server sends with an image content type (others go out as text/plain)
+STATIC_IMAGE_TYPES = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+IMAGE_MIME_TYPES = {".avif": "image/avif", ".webp": "image/webp", ".png": "image/png",
+                    ".gif": "image/gif", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+THEME_CSS = """
+<style>
+.stApp {{
+    {background}
+    background-size: cover;
+    background-position: center;
+}}
+.custom-label {{
+    font-size: 18px;
+    font-weight: bold;
+    color: #FFFFFF; /* Change to any color */
+}}
+.password-label {{
+    font-size: 18px;
+    font-weight: bold;
+    color: #338aff; /* Change to any color */
+}}
+</style>
+"""
+
+logger = logging.getLogger(__name__)
+
+# Built CSS per image, reused by every session: image -> (file stamp, css)
+_css_cache = {}
+_css_lock = threading.Lock()
+
+
+# Function to build the background rule: a fingerprinted static URL when Streamlit can
+# serve the image, otherwise the image inlined as a data URI
+def _background_rule(image_name):
+    static_path = os.path.join(STATIC_DIR, os.path.basename(image_name))
+    extension = os.path.splitext(image_name)[1].lower()
+    if (extension in STATIC_IMAGE_TYPES and os.path.exists(static_path)
+            and st.get_option("server.enableStaticServing")):
+        with open(static_path, "rb") as img_file:
+            fingerprint = hashlib.sha1(img_file.read()).hexdigest()[:12]
+        return f'background-image: url("app/static/{os.path.basename(image_name)}?v={fingerprint}");'
+
+    for path in (image_name, static_path):
+        if os.path.exists(path):
+            with open(path, "rb") as img_file:
+                base64_image = base64.b64encode(img_file.read()).decode()
+            mime_type = IMAGE_MIME_TYPES.get(extension, "application/octet-stream")
+            return f'background-image: url("data:{mime_type};base64,{base64_image}");'
+
+    logger.warning("Background image %s not found; using the default background", image_name)
+    return ""
+
+
+# Function to get the theme CSS, built once per process (and again only if the image changes)
+def theme_css(image_name=BACKGROUND_IMAGE):
+    path = image_name if os.path.exists(image_name) else os.path.join(STATIC_DIR, os.path.basename(image_name))
+    stamp = (os.stat(path).st_mtime_ns, os.stat(path).st_size) if os.path.exists(path) else None
+    entry = _css_cache.get(image_name)
+    if entry is None or entry[0] != stamp:
+        with _css_lock:
+            entry = _css_cache.get(image_name)
+            if entry is None or entry[0] != stamp:
+                entry = (stamp, THEME_CSS.format(background=_background_rule(image_name)))
+                _css_cache[image_name] = entry
+    return entry[1]
+
+
+# Function to set background image
+def set_background(image_name=BACKGROUND_IMAGE):
+    st.markdown(theme_css(image_name), unsafe_allow_html=True)